@@ -1,54 +1,311 @@
-"""Build standalone executable using PyInstaller."""
+"""Build standalone executable using PyInstaller.
 
+Usage:
+    python build_executable.py [--mode onedir|onefile] [--entry FILE] [--icon FILE]
+                               [--fresh] [--upx-dir DIR]
+
+By default the bundle is built in one-folder (``--onedir``) mode: a onefile
+binary has to unpack its whole archive to a temp directory on every launch,
+which dominates CLI start-up time. The folder is zipped afterwards for
+distribution, so the trade-off is more files on disk after extraction in
+exchange for a much faster launch.
+"""
+
+import argparse
+import getpass
+import hashlib
+import importlib
+import importlib.util
+import os
+import pkgutil
+import shutil
 import subprocess
 import sys
 import platform
+import tempfile
 from pathlib import Path
+from typing import Optional
+
+# Modules pulled in transitively (mostly by paramiko/pydantic) that infra-mapper
+# never imports. Remove an entry here if the code starts using that module.
+EXCLUDED_MODULES = [
+    "tkinter",      # GUI toolkit
+    "turtle",       # tkinter-based graphics
+    "test",         # CPython regression tests
+    "unittest",     # test framework
+    "pydoc",        # docs browser (rich.pager only loads it for Console.pager)
+    "pydoc_data",   # pydoc topic data
+    "xml.dom",      # DOM parser
+    "xmlrpc",       # XML-RPC client/server
+    "http.server",  # HTTP server
+    "cgi",          # CGI helpers
+    "cgitb",        # CGI tracebacks
+    "distutils",    # legacy packaging
+    "setuptools",   # packaging
+    "pip",          # installer
+    "wheel",        # packaging
+    "ensurepip",    # bundled pip
+    "lib2to3",      # 2to3 fixers
+    "curses",       # terminal UI (rich does not use it)
+    "sqlite3",      # database
+    "dbm",          # database
+]
+# Deliberately kept: html (HtmlGenerator uses html.escape) and _decimal
+# (pydantic imports decimal; dropping the C module means the slow fallback).
+
+
+def _package_modules(package: str = "infra_mapper") -> list:
+    """List the package and every submodule beneath it.
 
+    Passing all of them as hidden imports keeps modules that are only imported
+    lazily (inside functions) or by name from silently dropping out of the
+    frozen bundle.
+    """
+    src_dir = str(Path(__file__).parent / "src")
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
 
-def build():
-    """Build infra-mapper as a standalone single-file executable."""
+    pkg = importlib.import_module(package)
+    return [package] + [
+        module.name for module in pkgutil.walk_packages(pkg.__path__, prefix=f"{package}.")
+    ]
+
+
+def build(
+    fresh: bool = False,
+    upx_dir: Optional[str] = None,
+    entry: Optional[str] = None,
+    icon: Optional[str] = None,
+    mode: str = "onedir",
+):
+    """Build infra-mapper as a standalone executable.
+
+    Args:
+        fresh: Pass --clean to PyInstaller, discarding its analysis cache for a
+            guaranteed-clean rebuild (e.g. release jobs). Local rebuilds reuse the
+            cache; delete build/ and dist/ to force a full rebuild by hand.
+        upx_dir: Directory containing the UPX binary. PyInstaller compresses the
+            bundled libraries with UPX whenever it is found here or on PATH.
+        entry: Entry script (default: entry_point.py)
+        icon: Icon file (default: assets/icon.ico, applied on Windows only)
+        mode: "onedir" (default, fast startup, zipped for distribution) or
+            "onefile" (single binary that unpacks itself on every launch)
+    """
     name = "infra-mapper"
-    entry_point = "entry_point.py"
-    icon_path = Path(__file__).parent / "assets" / "icon.ico"
+    # entry_point.py rather than src/infra_mapper/__main__.py: the latter uses
+    # relative imports and cannot be run as a top-level script.
+    entry_point = entry or "entry_point.py"
+    if icon:
+        icon_path = Path(icon)
+    elif platform.system() == "Windows":
+        icon_path = Path(__file__).parent / "assets" / "icon.ico"
+    else:
+        icon_path = None
+    manifest_path = Path(__file__).parent / "assets" / "infra-mapper.manifest"
+    runtime_hook = Path(__file__).parent / "runtime_hook.py"
 
     cmd = [
         sys.executable, "-m", "PyInstaller",
-        "--onefile",
+        f"--{mode}",
         "--name", name,
-        "--clean",
         "--noconfirm",
-        # Hidden imports that PyInstaller may miss during static analysis
+        # Strip docstrings and asserts from bundled bytecode: smaller archive and
+        # less to unmarshal at startup. Drop to 1 if a dependency needs asserts.
+        "--optimize", "2",
+        "--runtime-hook", str(runtime_hook),
+        # Third-party hidden imports that PyInstaller may miss during static analysis.
+        # infra_mapper's own modules are added below by walking the package.
         "--hidden-import", "paramiko",
         "--hidden-import", "pydantic",
         "--hidden-import", "pydantic.deprecated.decorator",
         "--hidden-import", "yaml",
+        # Only the rich modules the CLI actually uses, plus their small data deps.
+        # Collecting every rich submodule drags lexers, markdown, tracebacks, etc.
+        # into the bundle for nothing.
         "--hidden-import", "rich",
         "--hidden-import", "rich.console",
         "--hidden-import", "rich.prompt",
         "--hidden-import", "rich.table",
         "--hidden-import", "rich.panel",
         "--hidden-import", "rich.progress",
-        # Collect all rich submodules (includes dynamically-loaded unicode data)
-        "--collect-submodules", "rich",
+        "--hidden-import", "rich.segment",
+        "--hidden-import", "rich.style",
+        "--hidden-import", "rich.text",
+        "--hidden-import", "rich.measure",
+        "--hidden-import", "rich.logging",
+        # rich modules that nothing bundled imports at runtime: only rich's demos,
+        # Console.print_json and Layout reach them. rich.traceback and rich.syntax
+        # must stay, since RichHandler (rich.logging) imports them.
+        "--exclude-module", "rich.markdown",
+        "--exclude-module", "rich.tree",
+        "--exclude-module", "rich.json",
     ]
 
-    # Add icon on Windows
-    if platform.system() == "Windows" and icon_path.exists():
+    # Unicode cell-width tables: rich < 14 ships rich._cell_widths, newer releases
+    # load a per-version table from rich._unicode_data via importlib at runtime.
+    if importlib.util.find_spec("rich._unicode_data") is not None:
+        cmd.extend(["--collect-submodules", "rich._unicode_data"])
+    else:
+        cmd.extend(["--hidden-import", "rich._cell_widths"])
+
+    for module in _package_modules():
+        cmd.extend(["--hidden-import", module])
+
+    for module in EXCLUDED_MODULES:
+        cmd.extend(["--exclude-module", module])
+
+    # Keep modules as plain .pyc files next to the executable instead of inside the
+    # compressed PYZ archive, so they load through the stdlib path finder rather
+    # than being decompressed one by one. Only onedir benefits: a onefile build
+    # would just have more files to extract.
+    if mode == "onedir":
+        cmd.extend(["--debug", "noarchive"])
+
+    if fresh:
+        cmd.append("--clean")
+
+    # Strip symbol tables from the bundled native libraries. Not applied on
+    # Windows, where PyInstaller's strip support does not work.
+    if platform.system() != "Windows":
+        cmd.append("--strip")
+
+    if upx_dir:
+        cmd.extend(["--upx-dir", upx_dir])
+
+    # UPX is known to corrupt loader-critical DLLs on Windows
+    if platform.system() == "Windows":
+        cmd.extend(["--upx-exclude", "vcruntime140.dll", "--upx-exclude", "python3*.dll"])
+
+    if icon_path is not None and icon_path.exists():
         cmd.extend(["--icon", str(icon_path)])
 
+    # UTF-8 active code page on Windows, so stdio needs no re-encoding at startup
+    if platform.system() == "Windows" and manifest_path.exists():
+        cmd.extend(["--manifest", str(manifest_path)])
+
     cmd.append(entry_point)
 
     print(f"Building {name} for {platform.system()}...")
-    subprocess.run(cmd, check=True)
+    subprocess.run(cmd, check=True, env=_build_env(entry_point))
 
-    if platform.system() == "Windows":
-        binary_path = f"dist\\{name}.exe"
+    binary_name = f"{name}.exe" if platform.system() == "Windows" else name
+    if mode == "onefile":
+        binary_path = Path("dist") / binary_name
     else:
-        binary_path = f"dist/{name}"
+        binary_path = Path("dist") / name / binary_name
 
     print(f"\nBuild complete! Binary at: {binary_path}")
 
+    _smoke_test(binary_path)
+
+    if mode == "onedir":
+        archive_path = _archive(Path("dist") / name)
+        print(f"Distribution archive: {archive_path}")
+
+
+def _smoke_test(binary_path: Path) -> None:
+    """Run the built binary through a real start-up and fail the build if it breaks.
+
+    `--help` returns before the lazily imported modules (rich.logging, prompts,
+    panels) are loaded, so it cannot catch a module missing from the bundle.
+    Instead the binary runs with an empty server list and empty answers to its
+    prompts, which takes it through logging setup, the banner and the server
+    prompt to a clean exit.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        config = Path(tmp) / "servers.json"
+        config.write_text('{"servers": []}\n', encoding="utf-8")
+        result = subprocess.run(
+            [str(binary_path.resolve()), "--config", str(config), "--format", "html"],
+            # Empty hostname ends the server prompt; the second newline answers
+            # the frozen build's "Press Enter to exit"
+            input="\n\n",
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            cwd=tmp,
+            timeout=120,
+        )
+
+    if result.returncode != 0 or "No servers configured" not in result.stdout:
+        print(result.stdout)
+        print(result.stderr, file=sys.stderr)
+        raise SystemExit(f"Smoke test failed: {binary_path} exited with {result.returncode}")
+    print("Smoke test passed")
+
+
+def _build_env(entry_point: str) -> dict:
+    """Environment for PyInstaller with a cache dir unique to this interpreter/platform.
+
+    Concurrent builds sharing one PyInstaller cache can corrupt its processed
+    binaries. Keying the cache on the interpreter, platform and entry point lets
+    parallel builds run safely while sequential builds keep reusing it.
+    """
+    key = hashlib.sha1(
+        f"{sys.version}-{platform.platform()}-{entry_point}".encode()
+    ).hexdigest()[:12]
+    config_dir = Path(tempfile.gettempdir()) / f"pyi-{getpass.getuser()}-{key}"
+    config_dir.mkdir(parents=True, exist_ok=True)
+
+    env = os.environ.copy()
+    env["PYINSTALLER_CONFIG_DIR"] = str(config_dir)
+    return env
+
+
+def _archive(bundle_dir: Path) -> Path:
+    """Zip the one-folder bundle for distribution."""
+    archive_path = bundle_dir.with_suffix(".zip")
+    if archive_path.exists():
+        archive_path.unlink()
+
+    if platform.system() == "Darwin":
+        # zip -y keeps the framework symlinks intact instead of duplicating them
+        subprocess.run(
+            ["zip", "-r", "-y", "-q", archive_path.name, bundle_dir.name],
+            cwd=bundle_dir.parent,
+            check=True,
+        )
+    else:
+        shutil.make_archive(str(bundle_dir), "zip", bundle_dir.parent, bundle_dir.name)
+
+    return archive_path
+
 
 if __name__ == "__main__":
-    build()
+    parser = argparse.ArgumentParser(description="Build the infra-mapper executable")
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Discard the PyInstaller cache and rebuild everything from scratch",
+    )
+    parser.add_argument(
+        "--upx-dir",
+        default=None,
+        help="Directory containing UPX (only needed when it is not on PATH)",
+    )
+    parser.add_argument(
+        "--entry",
+        default=None,
+        help="Entry script to freeze (default: entry_point.py)",
+    )
+    parser.add_argument(
+        "--icon",
+        default=None,
+        help="Executable icon (default: assets/icon.ico on Windows, none elsewhere)",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["onedir", "onefile"],
+        default="onedir",
+        help="Bundle layout: onedir starts much faster, onefile is a single binary",
+    )
+    args = parser.parse_args()
+
+    build(
+        fresh=args.fresh,
+        upx_dir=args.upx_dir,
+        entry=args.entry,
+        icon=args.icon,
+        mode=args.mode,
+    )
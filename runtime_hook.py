@@ -0,0 +1,17 @@
+"""PyInstaller runtime hook for infra-mapper.
+
+Runs in the frozen binary before the entry point. It front-loads the two
+one-shot costs of a normal run -- building the pydantic model schemas and
+loading rich's unicode cell-width table -- so they are paid before the UI
+starts instead of stalling the first render of the progress bar. Skipped for
+--help, which needs neither.
+"""
+
+import sys
+
+if not {"-h", "--help"} & set(sys.argv[1:]):
+    from rich.cells import cell_len
+
+    cell_len("\U0001f433")  # loads the width table for the terminal's unicode version
+
+    import infra_mapper.models.server  # noqa: F401  (schemas are built at class creation)
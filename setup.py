@@ -1,40 +1,5 @@
-from setuptools import setup, find_packages
+"""Legacy shim; package metadata lives in pyproject.toml."""
 
-with open("README.md", "r", encoding="utf-8") as fh:
-    long_description = fh.read()
+from setuptools import setup
 
-with open("requirements.txt", "r", encoding="utf-8") as fh:
-    requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
-
-setup(
-    name="infra-mapper",
-    version="1.1.1",
-    author="vvv850",
-    url="https://github.com/vvv850/infra-mapper",
-    description="Automated Docker infrastructure discovery and visualization tool",
-    long_description=long_description,
-    long_description_content_type="text/markdown",
-    packages=find_packages(where="src"),
-    package_dir={"": "src"},
-    install_requires=requirements,
-    extras_require={
-        "dev": ["pyinstaller>=6.0"],
-    },
-    entry_points={
-        "console_scripts": [
-            "infra-mapper=infra_mapper.__main__:main",
-        ],
-    },
-    python_requires=">=3.10",
-    classifiers=[
-        "Development Status :: 3 - Alpha",
-        "Intended Audience :: System Administrators",
-        "Topic :: System :: Systems Administration",
-        "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.10",
-        "Programming Language :: Python :: 3.11",
-        "Programming Language :: Python :: 3.12",
-        "License :: OSI Approved :: MIT License",
-        "Operating System :: OS Independent",
-    ],
-)
+setup()
@@ -1,74 +1,114 @@
 """Main entry point for the Infrastructure Mapper CLI application."""
 
+from __future__ import annotations
+
 import argparse
 import sys
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
-
-from rich.console import Console
-from rich.prompt import Prompt, Confirm
-from rich.table import Table
-from rich.progress import track, Progress, SpinnerColumn, TextColumn, BarColumn
-from rich.panel import Panel
-
-from .core.config_manager import ConfigManager
-from .core.ssh_manager import SSHConnectionManager
-from .core.docker_discovery import DockerDiscoveryService
-from .generators.mermaid_generator import MermaidGenerator
-from .generators.html_generator import HtmlGenerator
-from .models.server import ServerCredentials, ServerInfo
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
 from .utils.exceptions import InfraMapperError, SSHConnectionError, DockerNotFoundError
 
-# Configure UTF-8 encoding for Windows console to handle emojis
+# rich, paramiko and pydantic are imported where they are used so that
+# `--help` and argument errors return without paying their import cost.
+if TYPE_CHECKING:
+    from rich.console import Console
+    from .models.server import ServerCredentials, ServerInfo
+
+# Configure UTF-8 encoding for Windows console to handle emojis. Reconfigure the
+# existing streams in place, and only when they are not UTF-8 already (the frozen
+# build's manifest sets the UTF-8 code page, so this is normally a no-op there).
 if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    for _stream in (sys.stdout, sys.stderr):
+        if _stream is not None and (_stream.encoding or "").lower() not in ('utf-8', 'utf8', 'cp65001'):
+            _stream.reconfigure(encoding='utf-8')
+
+# Default number of servers scanned in parallel
+DEFAULT_MAX_WORKERS = 16
+
+# Key offered when prompting for an SSH private key
+_DEFAULT_SSH_KEY = str(Path.home() / ".ssh" / "id_rsa")
+
+_console_instance: Optional[Console] = None
+
+
+def _console() -> Console:
+    """Return the shared rich console, creating it on first use."""
+    global _console_instance
+    if _console_instance is None:
+        from rich.console import Console
+
+        _console_instance = Console()
+    return _console_instance
+
+
+def _configure_logging() -> None:
+    """Route log records through the shared console so they print above progress bars."""
+    import logging
 
-console = Console()
+    from rich.logging import RichHandler
+
+    logging.basicConfig(
+        level=logging.WARNING,
+        format="%(message)s",
+        handlers=[RichHandler(console=_console(), show_time=False, show_path=False)],
+    )
 
 
 class InfraMapper:
     """Main application orchestrator for Infrastructure Mapper."""
 
-    def __init__(self, config_path: Optional[str] = None, output_format: Optional[str] = None):
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        output_format: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
         """Initialize the Infrastructure Mapper application."""
+        from .core.config_manager import ConfigManager
+
         if config_path:
             self.config_manager = ConfigManager(config_file=Path(config_path))
         else:
             self.config_manager = ConfigManager()
         self.output_format = output_format
-        self._passwords: Dict[str, str] = {}
+        self.max_workers = max_workers
+        self._passwords: Dict[ServerCredentials, str] = {}
+        self._print_lock = threading.Lock()
 
     def run(self) -> None:
         """Main execution flow."""
+        from rich.panel import Panel
+        from rich.prompt import Prompt
+
         try:
             # Display banner
-            console.print(
+            _console().print(
                 Panel.fit(
                     "[bold cyan]Docker Infrastructure Mapper[/bold cyan]\n"
                     "Discover and visualize Docker containers across servers",
                     border_style="cyan",
                 )
             )
-            console.print()
+            _console().print()
 
             # Get server configurations
             servers = self._get_server_configurations()
 
             if not servers:
-                console.print("[red]No servers configured. Exiting.[/red]")
+                _console().print("[red]No servers configured. Exiting.[/red]")
                 return
 
             # Display configured servers
             self._display_servers_table(servers)
 
             # Discover containers on all servers
-            console.print("\n[bold]Discovering Docker containers...[/bold]\n")
-            server_info_list = self._discover_all_servers(servers)
+            _console().print("\n[bold]Discovering Docker containers...[/bold]\n")
+            server_info_list, totals = self._discover_all_servers(servers)
 
             # Display summary
-            self._display_summary(server_info_list)
+            self._display_summary(len(server_info_list), totals)
 
             # Choose output format
             fmt = self.output_format
@@ -83,43 +123,51 @@ class InfraMapper:
 
             for current_fmt in formats:
                 if current_fmt == "html":
+                    from .generators.html_generator import HtmlGenerator
+
                     generator = HtmlGenerator()
-                    console.print("\n[bold]Generating HTML output...[/bold]")
+                    _console().print("\n[bold]Generating HTML output...[/bold]")
                     output_file = "infrastructure.html"
                     hint = f"Open {output_file} in a browser or paste into your documentation platform's source editor"
                 else:
+                    from .generators.mermaid_generator import MermaidGenerator
+
                     generator = MermaidGenerator()
-                    console.print("\n[bold]Generating Mermaid diagram...[/bold]")
+                    _console().print("\n[bold]Generating Mermaid diagram...[/bold]")
                     output_file = "infrastructure.md"
                     hint = f"Open {output_file} in a Markdown viewer to see the rendered diagram"
 
-                content = generator.generate(server_info_list)
-                saved_path = generator.save_to_file(content, output_file)
-                console.print(f"[green]Output saved to {saved_path}[/green]")
+                saved_path = generator.generate_to_file(server_info_list, output_file)
+                _console().print(f"[green]Output saved to {saved_path}[/green]")
 
             # Preview the last generated format
-            console.print("\n[bold]Preview:[/bold]")
-            console.print(content)
-            console.print(f"\n[dim]{hint}[/dim]")
+            _console().print("\n[bold]Preview:[/bold]")
+            _console().print(generator.generate(server_info_list))
+            _console().print(f"\n[dim]{hint}[/dim]")
 
         except KeyboardInterrupt:
-            console.print("\n[yellow]Operation cancelled by user[/yellow]")
+            _console().print("\n[yellow]Operation cancelled by user[/yellow]")
             sys.exit(0)
         except InfraMapperError as e:
-            console.print(f"\n[red]Error: {e}[/red]")
+            _console().print(f"\n[red]Error: {e}[/red]")
             sys.exit(1)
         except Exception as e:
-            console.print(f"\n[red]Unexpected error: {e}[/red]")
+            _console().print(f"\n[red]Unexpected error: {e}[/red]")
             sys.exit(1)
 
     def _get_server_configurations(self) -> List[ServerCredentials]:
         """Get server configurations from user or config file."""
+        from rich.prompt import Prompt, Confirm
+
+        # Set when a config file exists but could not be loaded; saving would replace it
+        load_failed = False
+
         if self.config_manager.config_exists():
             # Config exists -- show count and ask to reuse
             try:
                 servers = self.config_manager.load_servers()
                 if servers:
-                    console.print(
+                    _console().print(
                         f"[cyan]Found saved configuration with "
                         f"{len(servers)} server(s) at {self.config_manager.config_file}[/cyan]"
                     )
@@ -128,15 +176,19 @@ class InfraMapper:
                     )
 
                     if use_saved:
-                        console.print("[green]Loaded saved configuration[/green]\n")
+                        _console().print("[green]Loaded saved configuration[/green]\n")
                         self._passwords.update(self._collect_passwords(servers))
                         return servers
             except Exception as e:
-                console.print(f"[yellow]Failed to load saved config: {e}[/yellow]")
-                console.print("[yellow]Starting fresh configuration...[/yellow]\n")
+                load_failed = True
+                _console().print(f"[yellow]Failed to load saved config: {e}[/yellow]")
+                _console().print(
+                    "[yellow]Starting fresh configuration; fix "
+                    f"{self.config_manager.config_file} to keep its servers.[/yellow]\n"
+                )
         else:
             # First run -- no config exists
-            console.print("[cyan]No server configuration found.[/cyan]")
+            _console().print("[cyan]No server configuration found.[/cyan]")
             choice = Prompt.ask(
                 "[cyan]Would you like to [bold](c)[/bold]reate one interactively "
                 "or generate a [bold](t)[/bold]emplate?[/cyan]",
@@ -145,7 +197,7 @@ class InfraMapper:
             )
             if choice == "t":
                 template_path = self.config_manager.generate_template()
-                console.print(
+                _console().print(
                     f"\n[green]Template created at {template_path}[/green]\n"
                     "[dim]Edit the file with your server details, then run infra-mapper again.[/dim]"
                 )
@@ -154,31 +206,41 @@ class InfraMapper:
         # Interactive prompting
         servers = self._prompt_servers()
 
-        # Offer to save configuration
+        # Offer to save configuration. Saving over a config that failed to load
+        # would discard its servers, so that has to be asked for explicitly.
         if servers:
-            save_config = Confirm.ask(
-                "\n[cyan]Save server configuration for future use?[/cyan]", default=True
-            )
+            if load_failed:
+                save_config = Confirm.ask(
+                    f"\n[yellow]Replace {self.config_manager.config_file} "
+                    "with these servers?[/yellow]",
+                    default=False,
+                )
+            else:
+                save_config = Confirm.ask(
+                    "\n[cyan]Save server configuration for future use?[/cyan]", default=True
+                )
 
             if save_config:
                 try:
                     self.config_manager.save_servers(servers)
-                    console.print(
+                    _console().print(
                         f"[green]Configuration saved to {self.config_manager.config_file}[/green]\n"
                     )
                 except Exception as e:
-                    console.print(f"[yellow]Failed to save config: {e}[/yellow]\n")
+                    _console().print(f"[yellow]Failed to save config: {e}[/yellow]\n")
 
         return servers
 
-    def _collect_passwords(self, servers: List[ServerCredentials]) -> Dict[str, str]:
+    def _collect_passwords(self, servers: List[ServerCredentials]) -> Dict[ServerCredentials, str]:
         """Prompt for passwords for servers using password authentication."""
-        passwords: Dict[str, str] = {}
+        from rich.prompt import Prompt
+
+        passwords: Dict[ServerCredentials, str] = {}
         password_servers = [s for s in servers if s.auth_method == "pass"]
         if not password_servers:
             return passwords
 
-        console.print(
+        _console().print(
             f"[cyan]{len(password_servers)} server(s) use password authentication.[/cyan]"
         )
         for server in password_servers:
@@ -186,17 +248,20 @@ class InfraMapper:
                 f"[cyan]Password for {server.username}@{server.hostname}[/cyan]",
                 password=True,
             )
-            passwords[f"{server.hostname}:{server.port}"] = password
+            passwords[server] = password
 
-        console.print()
+        _console().print()
         return passwords
 
     def _prompt_servers(self) -> List[ServerCredentials]:
         """Prompt user for server information."""
+        from rich.prompt import Prompt
+        from .models.server import ServerCredentials
+
         servers = []
 
-        console.print("[bold cyan]Server Configuration[/bold cyan]")
-        console.print(
+        _console().print("[bold cyan]Server Configuration[/bold cyan]")
+        _console().print(
             "[dim]Enter details for each server (leave hostname empty to finish)[/dim]\n"
         )
 
@@ -223,7 +288,7 @@ class InfraMapper:
             try:
                 port = int(port_str)
             except ValueError:
-                console.print("[red]Invalid port number. Using default 22.[/red]")
+                _console().print("[red]Invalid port number. Using default 22.[/red]")
                 port = 22
 
             # Prompt for authentication method
@@ -237,7 +302,7 @@ class InfraMapper:
                 # SSH key path with validation loop
                 key_path = self._prompt_ssh_key_path()
                 if key_path is None:
-                    console.print("[yellow]Skipping this server[/yellow]\n")
+                    _console().print("[yellow]Skipping this server[/yellow]\n")
                     continue
 
                 try:
@@ -249,16 +314,15 @@ class InfraMapper:
                         port=port,
                     )
                     servers.append(server)
-                    console.print(f"[green]Added {hostname} (key auth)[/green]\n")
+                    _console().print(f"[green]Added {hostname} (key auth)[/green]\n")
                 except Exception as e:
-                    console.print(f"[red]Failed to add server: {e}[/red]\n")
+                    _console().print(f"[red]Failed to add server: {e}[/red]\n")
             elif auth_method == "pass":
                 # Password auth -- prompt password now (won't be saved)
                 password = Prompt.ask(
                     f"[cyan]Password for {username}@{hostname}[/cyan]",
                     password=True,
                 )
-                self._passwords[f"{hostname}:{port}"] = password
 
                 try:
                     server = ServerCredentials(
@@ -267,10 +331,11 @@ class InfraMapper:
                         auth_method="pass",
                         port=port,
                     )
+                    self._passwords[server] = password
                     servers.append(server)
-                    console.print(f"[green]Added {hostname} (password auth)[/green]\n")
+                    _console().print(f"[green]Added {hostname} (password auth)[/green]\n")
                 except Exception as e:
-                    console.print(f"[red]Failed to add server: {e}[/red]\n")
+                    _console().print(f"[red]Failed to add server: {e}[/red]\n")
             else:
                 # Agent auth -- uses system SSH agent (1Password, ssh-agent, Pageant)
                 try:
@@ -281,25 +346,26 @@ class InfraMapper:
                         port=port,
                     )
                     servers.append(server)
-                    console.print(f"[green]Added {hostname} (agent auth)[/green]\n")
+                    _console().print(f"[green]Added {hostname} (agent auth)[/green]\n")
                 except Exception as e:
-                    console.print(f"[red]Failed to add server: {e}[/red]\n")
+                    _console().print(f"[red]Failed to add server: {e}[/red]\n")
 
         return servers
 
     def _prompt_ssh_key_path(self) -> Optional[Path]:
         """Prompt for SSH key path with validation loop."""
-        default_key = str(Path.home() / ".ssh" / "id_rsa")
+        from rich.prompt import Prompt, Confirm
+
         key_path = None
 
         while key_path is None:
             key_path_str = Prompt.ask(
-                "[cyan]SSH private key path[/cyan]", default=default_key
+                "[cyan]SSH private key path[/cyan]", default=_DEFAULT_SSH_KEY
             )
             temp_key_path = Path(key_path_str).expanduser()
 
             if not temp_key_path.exists():
-                console.print(f"[red]SSH key not found: {temp_key_path}[/red]")
+                _console().print(f"[red]SSH key not found: {temp_key_path}[/red]")
                 retry = Confirm.ask("Try a different key?", default=True)
                 if not retry:
                     return None
@@ -310,6 +376,8 @@ class InfraMapper:
 
     def _display_servers_table(self, servers: List[ServerCredentials]) -> None:
         """Display configured servers in a formatted table."""
+        from rich.table import Table
+
         table = Table(title="Configured Servers", show_header=True, header_style="bold cyan")
 
         table.add_column("Hostname", style="cyan", no_wrap=True)
@@ -335,23 +403,69 @@ class InfraMapper:
                 auth_display, key_display
             )
 
-        console.print(table)
-
-    def _discover_all_servers(self, servers: List[ServerCredentials]) -> List[ServerInfo]:
-        """Discover containers on all servers with progress tracking."""
-        server_info_list = []
-
-        for server in track(
-            servers, description="[cyan]Scanning servers...[/cyan]", console=console
-        ):
-            info = self._discover_server(server)
-            server_info_list.append(info)
-
-        return server_info_list
+        _console().print(table)
+
+    def _discover_all_servers(
+        self, servers: List[ServerCredentials]
+    ) -> Tuple[List[ServerInfo], Dict[str, int]]:
+        """Discover containers on all servers concurrently with progress tracking.
+
+        Discovery is dominated by SSH round-trips, so servers are scanned from a
+        thread pool. Each server's status line is printed as soon as its scan
+        finishes, and the summary totals are accumulated along the way.
+
+        Returns:
+            Tuple of (server infos in the order of ``servers``, summary totals)
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+
+        server_info_list: List[Optional[ServerInfo]] = [None] * len(servers)
+        totals = {"connected": 0, "containers": 0, "stacks": 0}
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("{task.description}"),
+            BarColumn(),
+            console=_console(),
+            # Each tick is a multi-second SSH scan; redrawing 10x/s is wasted work.
+            # transient clears the bar so it doesn't mix with the summary below.
+            refresh_per_second=2,
+            transient=True,
+        ) as progress:
+            task = progress.add_task("[cyan]Scanning servers...[/cyan]", total=len(servers))
+
+            workers = max(1, min(self.max_workers, len(servers)))
+            executor = ThreadPoolExecutor(max_workers=workers)
+            try:
+                futures = {
+                    executor.submit(self._discover_server, server): idx
+                    for idx, server in enumerate(servers)
+                }
+                for future in as_completed(futures):
+                    info = future.result()
+                    server_info_list[futures[future]] = info
+
+                    if info.is_connected:
+                        totals["connected"] += 1
+                    totals["containers"] += info.total_containers
+                    totals["stacks"] += len(info.docker_stacks)
+
+                    self._report(self._format_server_status(info))
+                    progress.advance(task)
+            except KeyboardInterrupt:
+                # Don't wait for queued scans, each of which can take a full SSH timeout
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            executor.shutdown()
+
+        return server_info_list, totals
 
     def _discover_server(self, server_creds: ServerCredentials) -> ServerInfo:
         """Discover containers on a single server."""
-        info = ServerInfo(credentials=server_creds)
+        from .core.docker_discovery import DockerDiscoveryService
+        from .core.ssh_manager import SSHConnectionManager
+        from .models.server import ConnectionStatus, ServerInfo
 
         try:
             # Build SSH connection kwargs based on auth method
@@ -362,13 +476,14 @@ class InfraMapper:
             }
 
             if server_creds.auth_method == "pass":
-                server_key = f"{server_creds.hostname}:{server_creds.port}"
-                password = self._passwords.get(server_key)
+                password = self._passwords.get(server_creds)
                 if not password:
-                    info.connection_status = "ssh_failed"
-                    info.error_message = "No password provided"
-                    console.print(f"  [red]{server_creds.hostname}: No password available[/red]")
-                    return info
+                    self._report(f"  [red]{server_creds.hostname}: No password available[/red]")
+                    return ServerInfo(
+                        credentials=server_creds,
+                        connection_status=ConnectionStatus.SSH_FAILED,
+                        error_message="No password provided",
+                    )
                 ssh_kwargs["password"] = password
             elif server_creds.auth_method == "agent":
                 ssh_kwargs["use_agent"] = True
@@ -382,51 +497,69 @@ class InfraMapper:
                 discovery = DockerDiscoveryService(ssh)
                 stacks, standalone = discovery.discover_containers()
 
-                info.docker_stacks = stacks
-                info.standalone_containers = standalone
-                info.connection_status = "success"
+            return ServerInfo(
+                credentials=server_creds,
+                docker_stacks=stacks,
+                standalone_containers=standalone,
+                connection_status=ConnectionStatus.SUCCESS,
+            )
 
         except SSHConnectionError as e:
-            info.connection_status = "ssh_failed"
-            info.error_message = str(e)
-            console.print(f"  [red]{server_creds.hostname}: SSH connection failed[/red]")
+            status = ConnectionStatus.SSH_FAILED
+            error = str(e)
+            self._report(f"  [red]{server_creds.hostname}: SSH connection failed[/red]")
 
         except DockerNotFoundError as e:
-            info.connection_status = "no_docker"
-            info.error_message = str(e)
-            console.print(f"  [yellow]{server_creds.hostname}: Docker not found[/yellow]")
+            status = ConnectionStatus.NO_DOCKER
+            error = str(e)
+            self._report(f"  [yellow]{server_creds.hostname}: Docker not found[/yellow]")
 
         except Exception as e:
-            info.connection_status = "failed"
-            info.error_message = str(e)
-            console.print(f"  [red]{server_creds.hostname}: {e}[/red]")
+            status = ConnectionStatus.FAILED
+            error = str(e)
+            self._report(f"  [red]{server_creds.hostname}: {e}[/red]")
 
-        return info
+        return ServerInfo(
+            credentials=server_creds, connection_status=status, error_message=error
+        )
 
-    def _display_summary(self, servers: List[ServerInfo]) -> None:
-        """Display discovery summary."""
-        console.print("\n[bold green]Discovery Summary[/bold green]\n")
+    def _report(self, message: str) -> None:
+        """Print a discovery message without interleaving output across worker threads."""
+        with self._print_lock:
+            _console().print(message)
+
+    @staticmethod
+    def _format_server_status(server: ServerInfo) -> str:
+        """Format the one-line discovery result for a server."""
+        if server.is_connected:
+            stacks = server.docker_stacks
+            status_icon = "[green]●[/green]"
+            status_text = f"{len(stacks)} stacks, {len(server.standalone_containers)} standalone, {server.total_containers} total"
+        else:
+            status_icon = "[red]●[/red]"
+            status_text = f"[dim]{server.connection_status}[/dim]"
 
-        total_servers = len(servers)
-        successful_servers = sum(1 for s in servers if s.is_connected)
-        total_containers = sum(s.total_containers for s in servers)
-        total_stacks = sum(len(s.docker_stacks) for s in servers)
+        return f"{status_icon} [bold]{server.credentials.hostname}[/bold]: {status_text}"
+
+    def _display_summary(self, total_servers: int, totals: Dict[str, int]) -> None:
+        """Display discovery summary from the totals gathered during discovery."""
+        _console().print("\n[bold green]Discovery Summary[/bold green]\n")
 
         # Overall stats
-        console.print(f"[bold]Servers:[/bold] {successful_servers}/{total_servers} connected")
-        console.print(f"[bold]Total Containers:[/bold] {total_containers}")
-        console.print(f"[bold]Docker Stacks:[/bold] {total_stacks}\n")
+        _console().print(f"[bold]Servers:[/bold] {totals['connected']}/{total_servers} connected")
+        _console().print(f"[bold]Total Containers:[/bold] {totals['containers']}")
+        _console().print(f"[bold]Docker Stacks:[/bold] {totals['stacks']}")
 
-        # Per-server details
-        for server in servers:
-            if server.is_connected:
-                status_icon = "[green]●[/green]"
-                status_text = f"{len(server.docker_stacks)} stacks, {len(server.standalone_containers)} standalone, {server.total_containers} total"
-            else:
-                status_icon = "[red]●[/red]"
-                status_text = f"[dim]{server.connection_status}[/dim]"
 
-            console.print(f"{status_icon} [bold]{server.credentials.hostname}[/bold]: {status_text}")
+def _positive_int(value: str) -> int:
+    """argparse type for options that must be a positive integer."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def main():
@@ -439,7 +572,7 @@ def main():
         "--config",
         type=str,
         default=None,
-        help="Path to custom servers.yaml config file",
+        help="Path to custom servers.yaml (or .json) config file",
     )
     parser.add_argument(
         "--format",
@@ -448,14 +581,26 @@ def main():
         default=None,
         help="Output format: mermaid, html, or both (prompts if not specified)",
     )
+    parser.add_argument(
+        "--max-workers",
+        type=_positive_int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f"Maximum number of servers scanned in parallel (default: {DEFAULT_MAX_WORKERS})",
+    )
     args = parser.parse_args()
 
-    app = InfraMapper(config_path=args.config, output_format=args.format)
+    _configure_logging()
+
+    app = InfraMapper(
+        config_path=args.config,
+        output_format=args.format,
+        max_workers=args.max_workers,
+    )
     app.run()
 
     # Keep console window open when launched by double-clicking the exe
     if getattr(sys, 'frozen', False):
-        console.print()
+        _console().print()
         input("Press Enter to exit...")
 
 
@@ -1,13 +1,43 @@
 """Configuration manager for persisting server settings."""
 
+import json
+import os
 import platform
+import stat
+import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import yaml
 
 from ..models.server import ServerCredentials
 from ..utils.exceptions import ConfigurationError
 
+# Prefer the libyaml C implementation when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+# orjson is optional; JSON config files fall back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(data: dict) -> bytes:
+    """Serialize config data as indented JSON."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n"
+    return (json.dumps(data, indent=2) + "\n").encode("utf-8")
+
+
+def _json_loads(raw: bytes):
+    """Parse JSON config data."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 class ConfigManager:
     """Manages configuration persistence for server credentials."""
@@ -19,6 +49,7 @@ class ConfigManager:
         Args:
             config_dir: Directory for configuration files (default: ~/.infra-mapper)
             config_file: Explicit path to config file. Overrides config_dir if provided.
+                A ``.json`` file is read and written as JSON instead of YAML.
         """
         if config_file is not None:
             self.config_file = Path(config_file).expanduser()
@@ -29,9 +60,15 @@ class ConfigManager:
             self.config_dir = Path(config_dir)
             self.config_file = self.config_dir / "servers.yaml"
 
+        self._is_json = self.config_file.suffix.lower() == ".json"
+
         # Create config directory if it doesn't exist
         self.config_dir.mkdir(parents=True, exist_ok=True)
 
+        # (file signature, servers) from the last load_servers(); reused while the
+        # signature is unchanged and cleared whenever the file is written
+        self._servers_cache: Optional[Tuple[Tuple[int, int, int], List[ServerCredentials]]] = None
+
     def save_servers(self, servers: List[ServerCredentials]) -> None:
         """
         Save server configurations to file.
@@ -47,18 +84,63 @@ class ConfigManager:
                 "servers": [self._serialize_server(s) for s in servers]
             }
 
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+            self._write_atomic(self._dump_bytes(data))
 
         except Exception as e:
             raise ConfigurationError(f"Failed to save configuration: {e}")
+        finally:
+            self._servers_cache = None
+
+    def _write_atomic(self, content: bytes) -> None:
+        """
+        Replace the config file with ``content`` in one step.
+
+        The data goes to a uniquely named sibling temp file, which is synced to
+        disk and given the current file's permissions before being renamed over
+        the config, so a crash mid-write leaves the previous file intact rather
+        than a torn one and concurrent runs never share a temp file.
+        """
+        tmp = tempfile.NamedTemporaryFile(
+            dir=self.config_file.parent,
+            prefix=f".{self.config_file.name}.",
+            suffix=".tmp",
+            delete=False,
+        )
+        try:
+            with tmp:
+                tmp.write(content)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            try:
+                os.chmod(tmp.name, stat.S_IMODE(self.config_file.stat().st_mode))
+            except FileNotFoundError:
+                # First save: keep the temp file's owner-only permissions
+                pass
+            os.replace(tmp.name, self.config_file)
+        except BaseException:
+            Path(tmp.name).unlink(missing_ok=True)
+            raise
+
+    def _dump_bytes(self, data: dict) -> bytes:
+        """Serialize config data in the file's format, ready for a single write."""
+        if self._is_json:
+            return _json_dumps(data)
+        return yaml.dump(
+            data, Dumper=_Dumper, encoding="utf-8", default_flow_style=False, sort_keys=False
+        )
+
+    def _load_bytes(self, raw: bytes):
+        """Parse config data read from the file in a single read."""
+        if self._is_json:
+            return _json_loads(raw)
+        return yaml.load(raw, Loader=_Loader)
 
     def _serialize_server(self, server: ServerCredentials) -> dict:
-        """Serialize a single server to dict for YAML output."""
+        """Serialize a single server to dict for YAML/JSON output."""
         entry = {
             "hostname": server.hostname,
             "username": server.username,
-            "auth_method": server.auth_method,
+            "auth_method": server.auth_method.value,
             "port": server.port,
         }
         if server.auth_method == "key" and server.ssh_key_path:
@@ -70,6 +152,11 @@ class ConfigManager:
         """
         Load server configurations from file.
 
+        The parsed list is cached against the file's modification time, size
+        and inode, so repeated calls do not re-read the file until it changes.
+        The size and inode catch edits made within the filesystem's mtime
+        granularity, unless they keep both the size and the file in place.
+
         Returns:
             List of ServerCredentials if config exists, None otherwise
 
@@ -80,40 +167,45 @@ class ConfigManager:
             return None
 
         try:
-            with open(self.config_file, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
+            st = self.config_file.stat()
+            signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+            if self._servers_cache is not None and self._servers_cache[0] == signature:
+                return list(self._servers_cache[1])
+
+            data = self._load_bytes(self.config_file.read_bytes())
 
             if not data or "servers" not in data:
                 return None
 
-            servers = []
+            rows = []
             for server in data["servers"]:
-                auth_method = server.get("auth_method", "key")
+                # Every key is passed on, so ServerCredentials rejects misspelled ones
+                kwargs = dict(server)
+                auth_method = kwargs.get("auth_method", "key")
                 if auth_method == "password":  # backward compat
                     auth_method = "pass"
-                kwargs = {
-                    "hostname": server["hostname"],
-                    "username": server["username"],
-                    "auth_method": auth_method,
-                    "port": server.get("port", 22),
-                }
-                if auth_method == "key":
-                    ssh_key_path = server.get("ssh_key_path")
-                    if ssh_key_path:
-                        kwargs["ssh_key_path"] = Path(ssh_key_path)
-                servers.append(ServerCredentials(**kwargs))
-
-            return servers
-
-        except yaml.YAMLError as e:
+                kwargs["auth_method"] = auth_method
+                if auth_method != "key" or not kwargs.get("ssh_key_path"):
+                    kwargs.pop("ssh_key_path", None)
+                rows.append(kwargs)
+
+            servers = ServerCredentials.validate_many(rows)
+
+            self._servers_cache = (signature, servers)
+            return list(servers)
+
+        except (yaml.YAMLError, json.JSONDecodeError) as e:
             raise ConfigurationError(f"Failed to parse configuration file: {e}")
         except (KeyError, TypeError, ValueError) as e:
             raise ConfigurationError(f"Invalid configuration format: {e}")
+        except FileNotFoundError:
+            # Removed since config_exists() looked
+            return None
         except Exception as e:
             raise ConfigurationError(f"Failed to load configuration: {e}")
 
     def generate_template(self) -> Path:
-        """Generate a template servers.yaml with example entries."""
+        """Generate a template config file (servers.yaml by default) with example entries."""
         if platform.system() == "Windows":
             example_key_path = "C:\\Users\\YourUser\\.ssh\\id_rsa"
         else:
@@ -143,15 +235,18 @@ class ConfigManager:
             ]
         }
 
-        with open(self.config_file, "w", encoding="utf-8") as f:
-            yaml.dump(template, f, default_flow_style=False, sort_keys=False)
-            f.write(
-                "\n# Authentication methods:\n"
-                "#   auth_method: key   - SSH private key (provide ssh_key_path)\n"
-                "#   auth_method: pass  - Prompts for password at runtime (never stored)\n"
-                "#   auth_method: agent - System SSH agent (1Password, ssh-agent, Pageant)\n"
+        content = self._dump_bytes(template)
+        if not self._is_json:
+            # JSON has no comments; there the auth methods are documented in the README
+            content += (
+                b"\n# Authentication methods:\n"
+                b"#   auth_method: key   - SSH private key (provide ssh_key_path)\n"
+                b"#   auth_method: pass  - Prompts for password at runtime (never stored)\n"
+                b"#   auth_method: agent - System SSH agent (1Password, ssh-agent, Pageant)\n"
             )
 
+        self._servers_cache = None
+        self._write_atomic(content)
         return self.config_file
 
     def config_exists(self) -> bool:
@@ -161,12 +256,12 @@ class ConfigManager:
         Returns:
             True if config file exists, False otherwise
         """
-        return self.config_file.exists() and self.config_file.is_file()
+        return self.config_file.is_file()
 
     def delete_config(self) -> None:
         """Delete configuration file if it exists."""
-        if self.config_exists():
-            self.config_file.unlink()
+        self._servers_cache = None
+        self.config_file.unlink(missing_ok=True)
 
     def __str__(self) -> str:
         """Format config manager as string for display."""
@@ -1,13 +1,88 @@
 """Docker container discovery service."""
 
 import json
-from typing import List, Dict, Tuple
+import logging
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Tuple, Union
 
 from ..models.container import Container
 from ..models.port_mapping import PortMapping
 from ..models.docker_stack import DockerStack
-from ..utils.exceptions import DockerNotFoundError, DockerPermissionError
-from .ssh_manager import SSHConnectionManager
+from ..utils.exceptions import DockerDaemonError, DockerNotFoundError, DockerPermissionError
+from .ssh_manager import SSHConnectionManager, ShellSession
+
+# orjson is optional; without it Docker's JSON output is parsed with the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+# Concurrent exec channels used when containers are inspected one by one;
+# together with the discovery shell, kept below sshd's default MaxSessions of 10
+_MAX_INSPECT_CHANNELS = 8
+
+# One published port (or port range) in `docker ps` output, e.g.
+# "0.0.0.0:8080->80/tcp", ":::8080->80/tcp", "[::]:8000-8001->8000-8001/tcp"
+_PS_PORT_RE = re.compile(
+    r"(?:(?P<ip>\[[^\]]*\]|[^,\s]*?):)?"
+    r"(?P<host>\d+)(?:-(?P<host_end>\d+))?"
+    r"->(?P<port>\d+)(?:-(?P<port_end>\d+))?/(?P<proto>\w+)"
+)
+
+# A NetworkSettings.Ports key in `docker inspect` output, e.g. "80/tcp"
+_INSPECT_PORT_RE = re.compile(r"(\d+)(?:/(tcp|udp|sctp))?")
+
+# A container creation time as printed by `docker ps` ("2024-01-02 03:04:05 +0000 UTC")
+# or `docker inspect` ("2024-01-02T03:04:05.123456789Z")
+_CREATED_RE = re.compile(
+    r"(?P<date>\d{4}-\d{2}-\d{2})[T ](?P<time>\d{2}:\d{2}:\d{2})(?:\.\d+)?"
+    r"\s*(?P<tz>Z|[+-]\d{2}:?\d{2})"
+)
+
+# Commands formatted with the docker prefix ("docker" or "sudo docker")
+_VERSION_COMMAND = "{docker} version --format '{{{{.Server.Version}}}}'"
+_PS_COMMAND = "{docker} ps --no-trunc --format '{{{{json .}}}}'"
+
+# `docker inspect --format` template projecting each container to a flat JSON
+# object (one per line) with just the fields _parse_container_data reads. Docker's
+# template functions cannot build a list of map keys, so network names come back
+# space-separated (they cannot contain spaces themselves).
+_INSPECT_FORMAT = (
+    '{"Id":{{json .Id}},"Name":{{json .Name}},"Created":{{json .Created}},'
+    '"Image":{{json .Config.Image}},"Status":{{json .State.Status}},'
+    '"Labels":{{json .Config.Labels}},"Ports":{{json .NetworkSettings.Ports}},'
+    '"Networks":"{{range $name, $net := .NetworkSettings.Networks}}{{$name}} {{end}}"}'
+)
+
+
+def _json_loads(raw: bytes):
+    """Parse JSON emitted by a Docker command."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _created_at(raw: Optional[str]) -> Optional[str]:
+    """
+    Normalize a container creation time to RFC 3339 in UTC, to the second.
+
+    `docker ps` and `docker inspect` print the same instant differently, so
+    both become e.g. "2024-01-02T03:04:05Z". Unrecognized values are kept as-is.
+    """
+    if not raw:
+        return None
+    match = _CREATED_RE.match(raw)
+    if match is None:
+        return raw
+    created = datetime.strptime(
+        f"{match['date']} {match['time']}{match['tz']}", "%Y-%m-%d %H:%M:%S%z"
+    )
+    return created.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 class DockerDiscoveryService:
@@ -21,6 +96,11 @@ class DockerDiscoveryService:
             ssh_manager: Connected SSH manager instance
         """
         self.ssh = ssh_manager
+        # Command used to run docker; narrowed to plain "docker" by
+        # _verify_docker_available() when sudo turns out to be unnecessary
+        self._docker_prefix = "sudo docker"
+        # Shell that discover_containers() runs its sequential commands in
+        self._shell: Optional[ShellSession] = None
 
     def discover_containers(self) -> Tuple[List[DockerStack], List[Container]]:
         """
@@ -33,22 +113,24 @@ class DockerDiscoveryService:
             DockerNotFoundError: If Docker is not installed
             DockerPermissionError: If Docker requires permissions
         """
-        # Verify Docker is available
-        self._verify_docker_available()
+        with self.ssh.shell_session() as shell:
+            self._shell = shell
+            try:
+                # Verify Docker is available
+                ps_result = self._verify_docker_available()
 
-        # Get all running containers
-        containers = self._get_all_containers()
+                # Get all running containers
+                containers = self._get_all_containers(ps_result)
+            finally:
+                self._shell = None
 
         # Separate into stacks and standalone
-        stacks_dict: Dict[str, List[Container]] = {}
+        stacks_dict: Dict[str, List[Container]] = defaultdict(list)
         standalone: List[Container] = []
 
         for container in containers:
             if container.is_compose_managed:
-                project = container.compose_project
-                if project not in stacks_dict:
-                    stacks_dict[project] = []
-                stacks_dict[project].append(container)
+                stacks_dict[container.compose_project].append(container)
             else:
                 standalone.append(container)
 
@@ -60,57 +142,196 @@ class DockerDiscoveryService:
 
         return stacks, standalone
 
-    def _verify_docker_available(self) -> None:
+    def _run(self, command: str, decode: bool = True) -> Tuple[int, Union[str, bytes], str]:
+        """Run a command in the discovery shell if one is open, else on its own channel."""
+        runner = self._shell if self._shell is not None else self.ssh
+        return runner.execute_command(command, decode=decode)
+
+    def _run_batch(
+        self, commands: List[str], decode: bool = True
+    ) -> List[Tuple[int, Union[str, bytes], str]]:
+        """Run commands in one round trip in the discovery shell, else one by one."""
+        if self._shell is not None:
+            return self._shell.execute_batch(commands, decode=decode)
+        return [self.ssh.execute_command(command, decode=decode) for command in commands]
+
+    def _verify_docker_available(self) -> Optional[Tuple[int, bytes, str]]:
         """
-        Verify Docker is installed and accessible.
+        Verify Docker is installed and accessible, and pick how to invoke it.
+
+        Docker is tried without sudo first, so users in the ``docker`` group skip
+        the sudo overhead on every later command. That probe is sent together
+        with `docker ps`, so when it succeeds the container list arrives in the
+        same round trip.
+
+        Plain `docker` talks to the daemon the login environment selects
+        (``DOCKER_HOST``, the current docker context, a rootless daemon), while
+        `sudo docker` talks to the system daemon. When both are set up, the
+        former is the one scanned.
+
+        Returns:
+            Result of the prefetched `docker ps` if plain docker works, else None
 
         Raises:
             DockerNotFoundError: If Docker is not found
             DockerPermissionError: If Docker requires permissions
+            DockerDaemonError: If Docker is installed but its daemon is not running
         """
-        exit_code, stdout, stderr = self.ssh.execute_command("sudo docker --version")
+        (exit_code, _, _), ps_result = self._run_batch(
+            [_VERSION_COMMAND.format(docker="docker"), _PS_COMMAND.format(docker="docker")],
+            decode=False,
+        )
+        if exit_code == 0:
+            self._docker_prefix = "docker"
+            return ps_result
+
+        exit_code, _, stderr = self._run(_VERSION_COMMAND.format(docker="sudo docker"))
+        if exit_code == 0:
+            self._docker_prefix = "sudo docker"
+            return None
+
+        # Both attempts failed; the sudo one explains why
+        stderr = stderr.lower()
+        if "cannot connect to the docker daemon" in stderr:
+            raise DockerDaemonError(
+                f"Docker daemon is not running on {self.ssh.hostname}. "
+                "Start it with: sudo systemctl start docker"
+            )
+        if "permission denied" in stderr:
+            raise DockerPermissionError(
+                f"Docker permission denied on {self.ssh.hostname}. "
+                "User needs sudo access to Docker."
+            )
+        raise DockerNotFoundError(
+            f"Docker not found on {self.ssh.hostname}. "
+            "Please install Docker on the target server."
+        )
+
+    def _get_all_containers(
+        self, ps_result: Optional[Tuple[int, bytes, str]] = None
+    ) -> List[Container]:
+        """
+        Get all running containers with full details.
+
+        `docker ps` already reports every field Container needs, so a single
+        `docker ps` call is enough. Falls back to `docker inspect` if its output
+        cannot be used.
+
+        Args:
+            ps_result: Output of `docker ps` already fetched, if any
+
+        Returns:
+            List of Container objects
+        """
+        if ps_result is None:
+            ps_result = self._run(_PS_COMMAND.format(docker=self._docker_prefix), decode=False)
+        exit_code, stdout, stderr = ps_result
 
         if exit_code != 0:
-            if "permission denied" in stderr.lower():
-                raise DockerPermissionError(
-                    f"Docker permission denied on {self.ssh.hostname}. "
-                    "User needs sudo access to Docker."
+            return self._inspect_all_containers()
+
+        containers = []
+        for line in stdout.splitlines():
+            if not line.strip():
+                continue
+
+            try:
+                entry = _json_loads(line)
+            except ValueError:
+                entry = None
+            if not isinstance(entry, dict):
+                # Not the JSON we asked for (very old Docker?) -- use inspect instead
+                return self._inspect_all_containers()
+
+            try:
+                containers.append(self._parse_ps_entry(entry))
+            except Exception as e:
+                # Log but continue with other containers
+                log.warning(
+                    "Failed to parse container %s on %s: %s",
+                    str(entry.get("ID") or "?")[:12], self.ssh.hostname, e,
                 )
-            raise DockerNotFoundError(
-                f"Docker not found on {self.ssh.hostname}. "
-                "Please install Docker on the target server."
-            )
+                continue
+
+        return containers
 
-    def _get_all_containers(self) -> List[Container]:
+    def _inspect_all_containers(self) -> List[Container]:
         """
-        Get all running containers with full details.
+        Get all running containers with a single batched `docker inspect`.
+
+        Docker projects each container down to the fields we use, one JSON
+        object per line. Falls back to inspecting containers one at a time if
+        that fails.
+
+        Returns:
+            List of Container objects
+        """
+        exit_code, stdout, stderr = self._run(
+            f"{self._docker_prefix} ps -q | "
+            f"xargs -r {self._docker_prefix} inspect --format '{_INSPECT_FORMAT}'",
+            decode=False,
+        )
+
+        if exit_code != 0:
+            return self._inspect_containers_individually()
+
+        try:
+            inspect_data = [_json_loads(line) for line in stdout.splitlines() if line.strip()]
+        except ValueError:
+            return self._inspect_containers_individually()
+
+        containers = []
+        for entry in inspect_data:
+            try:
+                containers.append(self._parse_container_data(entry))
+            except Exception as e:
+                # Log but continue with other containers
+                container_id = str(entry.get("Id") or "?")[:12] if isinstance(entry, dict) else "?"
+                log.warning(
+                    "Failed to inspect container %s on %s: %s",
+                    container_id, self.ssh.hostname, e,
+                )
+                continue
+
+        return containers
+
+    def _inspect_containers_individually(self) -> List[Container]:
+        """
+        Get running containers by inspecting each one with its own command.
+
+        The inspects run in parallel, each on its own channel of the same SSH
+        connection, so the per-command round trips overlap.
 
         Returns:
             List of Container objects
         """
         # Get container IDs
-        exit_code, stdout, stderr = self.ssh.execute_command(
-            "sudo docker ps --format '{{.ID}}'"
+        exit_code, stdout, stderr = self._run(
+            f"{self._docker_prefix} ps --format '{{{{.ID}}}}'"
         )
 
         if exit_code != 0 or not stdout.strip():
             return []
 
-        container_ids = stdout.strip().split("\n")
+        container_ids = [cid.strip() for cid in stdout.strip().split("\n") if cid.strip()]
 
         # Get full details for each container
-        containers = []
-        for container_id in container_ids:
-            if not container_id.strip():
-                continue
+        workers = min(_MAX_INSPECT_CHANNELS, len(container_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._inspect_container, cid) for cid in container_ids]
 
+        containers = []
+        for container_id, future in zip(container_ids, futures):
             try:
-                container = self._inspect_container(container_id.strip())
+                container = future.result()
                 if container:
                     containers.append(container)
             except Exception as e:
                 # Log but continue with other containers
-                print(f"Warning: Failed to inspect container {container_id}: {e}")
+                log.warning(
+                    "Failed to inspect container %s on %s: %s",
+                    container_id, self.ssh.hostname, e,
+                )
                 continue
 
         return containers
@@ -126,75 +347,158 @@ class DockerDiscoveryService:
             Container object with full details
         """
         exit_code, stdout, stderr = self.ssh.execute_command(
-            f"sudo docker inspect {container_id}"
+            f"{self._docker_prefix} inspect --format '{_INSPECT_FORMAT}' {container_id}",
+            decode=False,
         )
 
         if exit_code != 0:
             raise RuntimeError(f"Failed to inspect container {container_id}: {stderr}")
 
         # Parse JSON output
-        container_data = json.loads(stdout)[0]
+        container_data = _json_loads(stdout)
         return self._parse_container_data(container_data)
 
+    def _parse_ps_entry(self, entry: Dict) -> Container:
+        """
+        Parse one `docker ps --format '{{json .}}'` record into Container model.
+
+        Args:
+            entry: Decoded JSON line from `docker ps`
+
+        Returns:
+            Container object
+        """
+        networks = [n for n in (entry.get("Networks") or "").split(",") if n]
+
+        # Docker's JSON only holds strings here, so validation is skipped
+        return Container.model_construct(
+            container_id=entry["ID"][:12],
+            name=entry["Names"].split(",")[0],
+            image=entry["Image"],
+            status=entry.get("State") or entry["Status"],
+            ports=self._parse_ps_ports(entry.get("Ports") or ""),
+            networks=networks,
+            labels=self._parse_ps_labels(entry.get("Labels") or ""),
+            created_at=_created_at(entry.get("CreatedAt")),
+        )
+
+    @staticmethod
+    def _parse_ps_ports(ports: str) -> List[PortMapping]:
+        """
+        Parse the `docker ps` Ports column into port mappings.
+
+        Exposed-but-unpublished ports (e.g. "80/tcp") are skipped, as with
+        `docker inspect`. Ranges are expanded to one mapping per port.
+
+        Args:
+            ports: Ports column, e.g. "0.0.0.0:8080->80/tcp, :::8080->80/tcp"
+
+        Returns:
+            List of PortMapping objects
+        """
+        mappings = []
+        for match in _PS_PORT_RE.finditer(ports):
+            host_ip = (match.group("ip") or "0.0.0.0").strip("[]")
+            host_start = int(match.group("host"))
+            container_start = int(match.group("port"))
+            host_end = int(match.group("host_end") or host_start)
+
+            for offset in range(host_end - host_start + 1):
+                mappings.append(
+                    PortMapping.model_construct(
+                        container_port=container_start + offset,
+                        host_port=host_start + offset,
+                        protocol=match.group("proto"),
+                        host_ip=host_ip,
+                    )
+                )
+
+        return mappings
+
+    @staticmethod
+    def _parse_ps_labels(labels: str) -> Dict[str, str]:
+        """
+        Parse the `docker ps` Labels column ("k1=v1,k2=v2") into a dict.
+
+        Label values may themselves contain commas (e.g. compose config file
+        lists), so a piece without "=" is joined back onto the previous value.
+
+        Args:
+            labels: Labels column
+
+        Returns:
+            Labels dict
+        """
+        parsed: Dict[str, str] = {}
+        last_key: Optional[str] = None
+
+        for piece in labels.split(","):
+            key, sep, value = piece.partition("=")
+            if sep:
+                parsed[key] = value
+                last_key = key
+            elif last_key is not None:
+                parsed[last_key] += f",{piece}"
+
+        return parsed
+
     def _parse_container_data(self, data: Dict) -> Container:
         """
-        Parse Docker inspect output into Container model.
+        Parse one projected Docker inspect record into Container model.
 
         Args:
-            data: Docker inspect JSON output
+            data: Decoded line of `docker inspect --format _INSPECT_FORMAT` output
 
         Returns:
             Container object
         """
         # Extract port mappings
         ports = []
-        port_bindings = data.get("NetworkSettings", {}).get("Ports", {})
+        port_bindings = data.get("Ports") or {}
 
         for container_port_proto, bindings in port_bindings.items():
             if not bindings:
                 continue
 
             # Parse container port and protocol
-            if "/" in container_port_proto:
-                port_str, protocol = container_port_proto.split("/", 1)
-            else:
-                port_str, protocol = container_port_proto, "tcp"
-
-            try:
-                container_port = int(port_str)
-            except ValueError:
+            match = _INSPECT_PORT_RE.fullmatch(container_port_proto)
+            if match is None:
                 continue
+            container_port = int(match.group(1))
+            protocol = match.group(2) or "tcp"
 
             # Add each host binding
             for binding in bindings:
+                host_ip = binding.get("HostIp") or "0.0.0.0"
                 try:
                     ports.append(
-                        PortMapping(
+                        PortMapping.model_construct(
                             container_port=container_port,
                             host_port=int(binding["HostPort"]),
                             protocol=protocol,
-                            host_ip=binding.get("HostIp", "0.0.0.0"),
+                            host_ip=host_ip,
                         )
                     )
                 except (KeyError, ValueError):
                     continue
 
         # Extract networks
-        networks = list(data.get("NetworkSettings", {}).get("Networks", {}).keys())
+        networks = (data.get("Networks") or "").split()
 
         # Extract labels
-        labels = data.get("Config", {}).get("Labels") or {}
+        labels = data.get("Labels") or {}
 
-        # Create container object
-        return Container(
+        # Create container object; every field was typed above, so
+        # validation is skipped
+        return Container.model_construct(
             container_id=data["Id"][:12],
             name=data["Name"].lstrip("/"),
-            image=data["Config"]["Image"],
-            status=data["State"]["Status"],
+            image=data["Image"],
+            status=data["Status"],
             ports=ports,
             networks=networks,
             labels=labels,
-            created_at=data.get("Created"),
+            created_at=_created_at(data.get("Created")),
         )
 
     def __str__(self) -> str:
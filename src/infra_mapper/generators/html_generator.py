@@ -1,9 +1,10 @@
 """HTML generator for infrastructure visualization."""
 
+import io
 from datetime import datetime
 from html import escape
 from pathlib import Path
-from typing import List
+from typing import List, TextIO
 
 from ..models.server import ServerInfo
 from ..models.docker_stack import DockerStack
@@ -40,6 +41,46 @@ class HtmlGenerator:
         "timestamp": "color: #999; font-size: 13px;",
     }
 
+    # Markup rendered once from STYLES; templates take their values via `%`
+    # formatting and every fragment ends in a newline
+    _H1 = f'<h1 style="{STYLES["h1"]}">Docker Infrastructure Map</h1>\n'
+    _TIMESTAMP_TPL = f'<p style="{STYLES["timestamp"]}"><em>Generated on %s</em></p>\n'
+    _H2_FAIL_TPL = f'<h2 style="{STYLES["h2_fail"]}">&#x1F5A5;&#xFE0F; %s (failed)</h2>\n'
+    _H2_OK_TPL = f'<h2 style="{STYLES["h2_ok"]}">&#x1F5A5;&#xFE0F; %s</h2>\n'
+    _ERROR_TPL = "<p><em>%s</em></p>\n"
+    _H3_STACK_TPL = f'<h3 style="{STYLES["h3_stack"]}">&#x1F4E6; Stack: %s</h3>\n'
+    _H3_STANDALONE = (
+        f'<h3 style="{STYLES["h3_standalone"]}">&#x1F433; Standalone Containers</h3>\n'
+    )
+    _TABLE_HEAD = (
+        f'<table style="{STYLES["table"]}">\n'
+        "  <thead>\n"
+        "    <tr>\n"
+        f'      <th style="{STYLES["th"]}">Container</th>\n'
+        f'      <th style="{STYLES["th"]}">Image</th>\n'
+        f'      <th style="{STYLES["th"]}">Ports</th>\n'
+        "    </tr>\n"
+        "  </thead>\n"
+        "  <tbody>\n"
+    )
+    _TABLE_TAIL = "  </tbody>\n</table>\n"
+    # Row templates for even and odd rows (odd rows use the alternate background)
+    _ROW_TPL = (
+        "    <tr>\n"
+        f'      <td style="{STYLES["td"]}">%s</td>\n'
+        f'      <td style="{STYLES["td"]}">%s</td>\n'
+        f'      <td style="{STYLES["td"]}">%s</td>\n'
+        "    </tr>\n",
+        "    <tr>\n"
+        f'      <td style="{STYLES["td_alt"]}">%s</td>\n'
+        f'      <td style="{STYLES["td_alt"]}">%s</td>\n'
+        f'      <td style="{STYLES["td_alt"]}">%s</td>\n'
+        "    </tr>\n",
+    )
+    _PORT_LINK_TPL = (
+        f'<a href="%s%d" style="{STYLES["port_link"]}">%d &rarr; %d/%s</a>'
+    )
+
     def generate(self, servers: List[ServerInfo]) -> str:
         """Generate HTML content fragment from server information.
 
@@ -49,116 +90,96 @@ class HtmlGenerator:
         Returns:
             HTML content fragment as string
         """
-        parts: List[str] = []
+        buf = io.StringIO()
+        self.generate_into(servers, buf)
+        # Drop the newline after the last fragment
+        return buf.getvalue()[:-1]
+
+    def generate_into(self, servers: List[ServerInfo], fh: TextIO) -> None:
+        """Write the HTML content fragment straight to a text stream.
+
+        Unlike :meth:`generate`, the fragment is never held in memory as a
+        whole, and it ends with a newline.
+
+        Args:
+            servers: List of server information objects
+            fh: Writable text stream, e.g. a file opened in text mode
+        """
+        write = fh.write
 
-        parts.append(f'<h1 style="{self.STYLES["h1"]}">Docker Infrastructure Map</h1>')
-        parts.append(
-            f'<p style="{self.STYLES["timestamp"]}"><em>Generated on {self._get_timestamp()}</em></p>'
-        )
+        write(self._H1)
+        write(self._TIMESTAMP_TPL % self._get_timestamp())
 
         for server in servers:
             hostname = escape(server.credentials.hostname)
 
-            if server.connection_status != "success":
-                parts.append(
-                    f'<h2 style="{self.STYLES["h2_fail"]}">&#x1F5A5;&#xFE0F; {hostname} (failed)</h2>'
-                )
+            if not server.is_connected:
+                write(self._H2_FAIL_TPL % hostname)
                 if server.error_message:
-                    parts.append(f"<p><em>{escape(server.error_message)}</em></p>")
+                    write(self._ERROR_TPL % escape(server.error_message))
                 continue
 
-            parts.append(
-                f'<h2 style="{self.STYLES["h2_ok"]}">&#x1F5A5;&#xFE0F; {hostname}</h2>'
-            )
+            write(self._H2_OK_TPL % hostname)
 
             # Stacks
             for stack in server.docker_stacks:
-                parts.extend(self._generate_stack_table(hostname, stack))
+                self._write_stack_table(write, hostname, stack)
 
             # Standalone containers
             if server.standalone_containers:
-                parts.extend(
-                    self._generate_standalone_table(hostname, server.standalone_containers)
-                )
-
-        return "\n".join(parts)
-
-    def _generate_stack_table(self, hostname: str, stack: DockerStack) -> List[str]:
-        """Generate an HTML table for a Docker Compose stack."""
-        parts: List[str] = []
-        safe_name = escape(stack.project_name)
-
-        parts.append(
-            f'<h3 style="{self.STYLES["h3_stack"]}">&#x1F4E6; Stack: {safe_name}</h3>'
-        )
-        parts.append(self._build_table(hostname, stack.containers))
-
-        return parts
-
-    def _generate_standalone_table(
-        self, hostname: str, containers: List[Container]
-    ) -> List[str]:
-        """Generate an HTML table for standalone containers."""
-        parts: List[str] = []
-
-        parts.append(
-            f'<h3 style="{self.STYLES["h3_standalone"]}">&#x1F433; Standalone Containers</h3>'
-        )
-        parts.append(self._build_table(hostname, containers))
-
-        return parts
-
-    def _build_table(self, hostname: str, containers: List[Container]) -> str:
-        """Build an HTML table for a list of containers."""
-        rows: List[str] = []
-
-        rows.append(f'<table style="{self.STYLES["table"]}">')
-        rows.append("  <thead>")
-        rows.append("    <tr>")
-        rows.append(f'      <th style="{self.STYLES["th"]}">Container</th>')
-        rows.append(f'      <th style="{self.STYLES["th"]}">Image</th>')
-        rows.append(f'      <th style="{self.STYLES["th"]}">Ports</th>')
-        rows.append("    </tr>")
-        rows.append("  </thead>")
-        rows.append("  <tbody>")
+                self._write_standalone_table(write, hostname, server.standalone_containers)
 
-        for idx, container in enumerate(containers):
-            td_style = self.STYLES["td_alt"] if idx % 2 else self.STYLES["td"]
-            safe_name = escape(container.name)
-            safe_image = escape(container.image)
+    def _write_stack_table(self, write, hostname: str, stack: DockerStack) -> None:
+        """Write the heading and HTML table for a Docker Compose stack."""
+        write(self._H3_STACK_TPL % escape(stack.project_name))
+        self._write_table(write, hostname, stack.containers)
 
-            port_parts = self._format_ports(hostname, container)
-            ports_html = port_parts if port_parts else "&mdash;"
+    def _write_standalone_table(
+        self, write, hostname: str, containers: List[Container]
+    ) -> None:
+        """Write the heading and HTML table for standalone containers."""
+        write(self._H3_STANDALONE)
+        self._write_table(write, hostname, containers)
 
-            rows.append("    <tr>")
-            rows.append(f'      <td style="{td_style}">{safe_name}</td>')
-            rows.append(f'      <td style="{td_style}">{safe_image}</td>')
-            rows.append(f'      <td style="{td_style}">{ports_html}</td>')
-            rows.append("    </tr>")
+    def _write_table(self, write, hostname: str, containers: List[Container]) -> None:
+        """Write an HTML table for a list of containers.
 
-        rows.append("  </tbody>")
-        rows.append("</table>")
+        ``hostname`` is already HTML-escaped; the URL prefixes built from it
+        are shared by every port link in the table.
+        """
+        row_tpl = self._ROW_TPL
+        format_ports = self._format_ports
+        http_prefix = f"http://{hostname}:"
+        https_prefix = f"https://{hostname}:"
 
-        return "\n".join(rows)
+        write(self._TABLE_HEAD)
 
-    def _format_ports(self, hostname: str, container: Container) -> str:
-        """Format port mappings as clickable links, deduplicating IPv4/IPv6."""
-        seen: dict[str, str] = {}
+        for idx, container in enumerate(containers):
+            write(row_tpl[idx & 1] % (
+                escape(container.name),
+                escape(container.image),
+                format_ports(http_prefix, https_prefix, container) or "&mdash;",
+            ))
 
-        for port in container.ports:
-            port_key = f"{port.host_port}_{port.container_port}_{port.protocol}"
-            if port_key in seen:
-                continue
+        write(self._TABLE_TAIL)
 
-            protocol = "https" if port.host_port == 443 else "http"
-            url = f"{protocol}://{escape(hostname)}:{port.host_port}"
-            display = f"{port.host_port} &rarr; {port.container_port}/{escape(port.protocol)}"
+    def _format_ports(self, http_prefix: str, https_prefix: str, container: Container) -> str:
+        """Format port mappings as clickable links, with IPv4/IPv6 duplicates removed.
 
-            seen[port_key] = (
-                f'<a href="{url}" style="{self.STYLES["port_link"]}">{display}</a>'
+        Links for port 443 use ``https_prefix``, all others ``http_prefix``.
+        """
+        link_tpl = self._PORT_LINK_TPL
+
+        return "<br>".join([
+            link_tpl % (
+                https_prefix if port.host_port == 443 else http_prefix,
+                port.host_port,
+                port.host_port,
+                port.container_port,
+                escape(port.protocol),
             )
-
-        return "<br>".join(seen.values())
+            for port in container.unique_ports
+        ])
 
     def save_to_file(
         self, content: str, filename: str = "infrastructure.html", output_dir: Path = None
@@ -181,6 +202,34 @@ class HtmlGenerator:
         output_path.write_text(content, encoding="utf-8")
         return output_path
 
+    def generate_to_file(
+        self,
+        servers: List[ServerInfo],
+        filename: str = "infrastructure.html",
+        output_dir: Path = None,
+    ) -> Path:
+        """Generate the HTML content fragment straight into a file.
+
+        The fragment is streamed to disk with :meth:`generate_into`, so it is
+        never held in memory as a whole. The file ends with a newline.
+
+        Args:
+            servers: List of server information objects
+            filename: Output filename (default: infrastructure.html)
+            output_dir: Output directory (default: current directory)
+
+        Returns:
+            Path to saved file
+        """
+        if output_dir is None:
+            output_path = Path(filename)
+        else:
+            output_path = Path(output_dir) / filename
+
+        with open(output_path, "w", encoding="utf-8") as fh:
+            self.generate_into(servers, fh)
+        return output_path
+
     @staticmethod
     def _get_timestamp() -> str:
         """Get current timestamp in readable format."""
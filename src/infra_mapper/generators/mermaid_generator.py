@@ -1,13 +1,29 @@
 """Mermaid diagram generator for infrastructure visualization."""
 
+import io
+import re
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, TextIO, Tuple, Union
 
 from ..models.server import ServerInfo
 from ..models.docker_stack import DockerStack
 from ..models.container import Container
 
+# Characters replaced by "_" when building node lookup keys: everything but
+# str.isalnum() characters, which includes non-ASCII letters and digits
+_NODE_SAFE_RE = re.compile(r"[\W_]")
+
+# Characters that might break Mermaid syntax, and their safe stand-ins
+_MERMAID_TRANS = str.maketrans({
+    '"': "'",
+    "[": "(",
+    "]": ")",
+    "{": "(",
+    "}": ")",
+    "|": "/",
+})
+
 
 class MermaidGenerator:
     """Generates Mermaid diagrams from infrastructure data."""
@@ -15,7 +31,67 @@ class MermaidGenerator:
     def __init__(self):
         """Initialize Mermaid generator."""
         self.node_counter = 0
-        self.node_map: Dict[str, str] = {}
+        # Keyed by "<prefix>_<sanitized name>", or a tuple for port nodes
+        self.node_map: Dict[Union[str, Tuple], str] = {}
+
+    # Diagram header with the CSS class definitions used for styling
+    _HEADER = (
+        "```mermaid\n"
+        "graph LR\n"
+        "    classDef server fill:#b3d9ff,stroke:#01579b,stroke-width:3px,color:#000\n"
+        "    classDef serverFailed fill:#ffcdd2,stroke:#c62828,stroke-width:2px,color:#000\n"
+        "    classDef stack fill:#ffe0b2,stroke:#e65100,stroke-width:2px,color:#000\n"
+        "    classDef container fill:#c8e6c9,stroke:#2e7d32,stroke-width:2px,color:#000\n"
+        "    classDef standalone fill:#e1bee7,stroke:#6a1b9a,stroke-width:2px,color:#000\n"
+        "    classDef port fill:#f8bbd0,stroke:#c2185b,stroke-width:1px,color:#000\n"
+        "\n"
+    )
+
+    # Node templates, filled in with `%` formatting; each ends in a newline
+    _SERVER_TPL = '    %s["🖥️ %s"]\n    class %s server\n'
+    _SERVER_FAILED_TPL = '    %s["🖥️ %s (failed)"]\n    class %s serverFailed\n'
+    _STACK_TPL = '    %s --> %s\n    %s["📦 Stack: %s"]\n    class %s stack\n'
+    _CONTAINER_TPL = (
+        '    %s --> %s\n    %s["%s %s<br/><small>%s</small>"]\n    class %s %s\n'
+    )
+    _PORT_TPL = (
+        "    %s --> %s\n"
+        '    %s["🔌 %d → %d/%s"]\n'
+        "    class %s port\n"
+        '    click %s href "%s%d"\n'
+    )
+
+    # Markdown document wrapped around the diagram by save_to_file and
+    # generate_to_file
+    _DOCUMENT_HEAD = """# Docker Infrastructure Map
+
+*Generated by Infrastructure Mapper on %s*
+
+## Overview
+
+This diagram shows the current state of Docker containers across all configured servers.
+
+"""
+    _DOCUMENT_TAIL = """
+
+## Legend
+
+- 🖥️ **Server**: Physical or virtual server
+- 📦 **Stack**: Docker Compose project (group of related containers)
+- 🐳 **Standalone Container**: Individual Docker container (not part of a stack)
+- 🔷 **Stack Container**: Container managed by Docker Compose
+- 🔌 **Port Mapping**: Exposed port (format: host_port → container_port/protocol)
+
+## Notes
+
+- Only running containers are shown
+- Port mappings show how services are exposed on the host
+- Containers in the same stack share the same Docker Compose project
+
+---
+
+*To update this diagram, run `infra-mapper` again*
+"""
 
     def generate(self, servers: List[ServerInfo]) -> str:
         """
@@ -27,158 +103,176 @@ class MermaidGenerator:
         Returns:
             Mermaid diagram as string
         """
+        buf = io.StringIO()
+        self.generate_into(servers, buf)
+        return buf.getvalue()
+
+    def generate_into(self, servers: List[ServerInfo], fh: TextIO) -> None:
+        """
+        Write Mermaid diagram straight to a text stream.
+
+        Args:
+            servers: List of server information objects
+            fh: Writable text stream, e.g. a file opened in text mode
+        """
         # Reset node mapping for fresh generation
         self.node_counter = 0
         self.node_map = {}
 
-        lines = ["```mermaid", "graph LR"]
-
-        # Add class definitions for styling
-        lines.extend(self._generate_styles())
+        write = fh.write
+        write(self._HEADER)
 
         for server in servers:
             server_hostname = server.credentials.hostname
+            # Sanitized once; stack, container and port keys all extend it
+            server_key = _NODE_SAFE_RE.sub("_", server_hostname)
+            server_id = self._get_node_id_for_key("server", server_key)
 
-            if server.connection_status != "success":
+            if not server.is_connected:
                 # Show failed servers with different styling
-                server_id = self._get_node_id("server", server_hostname)
-                lines.append(f"    {server_id}[\"🖥️ {server_hostname} (failed)\"]")
-                lines.append(f"    class {server_id} serverFailed")
+                write(self._SERVER_FAILED_TPL % (server_id, server_hostname, server_id))
                 continue
 
-            server_id = self._get_node_id("server", server_hostname)
-            lines.append(f"    {server_id}[\"🖥️ {server_hostname}\"]")
-            lines.append(f"    class {server_id} server")
+            write(self._SERVER_TPL % (server_id, server_hostname, server_id))
 
             # Add Docker stacks
             for stack in server.docker_stacks:
-                stack_lines = self._generate_stack(server_id, server_hostname, stack)
-                lines.extend(stack_lines)
+                self._write_stack(write, server_id, server_hostname, server_key, stack)
 
             # Add standalone containers
             for container in server.standalone_containers:
-                container_lines = self._generate_container(
-                    server_id, server_hostname, container, is_standalone=True
+                self._write_container(
+                    write, server_id, server_hostname, server_key, container,
+                    is_standalone=True,
                 )
-                lines.extend(container_lines)
-
-        lines.append("```")
-        return "\n".join(lines)
-
-    def _generate_styles(self) -> List[str]:
-        """Generate CSS class definitions for Mermaid styling."""
-        return [
-            "    classDef server fill:#b3d9ff,stroke:#01579b,stroke-width:3px,color:#000",
-            "    classDef serverFailed fill:#ffcdd2,stroke:#c62828,stroke-width:2px,color:#000",
-            "    classDef stack fill:#ffe0b2,stroke:#e65100,stroke-width:2px,color:#000",
-            "    classDef container fill:#c8e6c9,stroke:#2e7d32,stroke-width:2px,color:#000",
-            "    classDef standalone fill:#e1bee7,stroke:#6a1b9a,stroke-width:2px,color:#000",
-            "    classDef port fill:#f8bbd0,stroke:#c2185b,stroke-width:1px,color:#000",
-            "",
-        ]
-
-    def _generate_stack(self, parent_id: str, server_hostname: str, stack: DockerStack) -> List[str]:
+
+        write("```")
+
+    def _write_stack(
+        self,
+        write,
+        parent_id: str,
+        server_hostname: str,
+        server_key: str,
+        stack: DockerStack,
+    ) -> None:
         """
-        Generate nodes for a Docker Compose stack.
+        Write nodes for a Docker Compose stack.
 
         Args:
+            write: Output buffer's write method
             parent_id: Parent server node ID
-            server_hostname: Hostname of the server (for unique node IDs)
+            server_hostname: Hostname of the server (for port URLs)
+            server_key: Sanitized hostname (for unique node IDs)
             stack: Docker stack object
-
-        Returns:
-            List of Mermaid diagram lines
         """
-        lines = []
-        stack_id = self._get_node_id("stack", f"{server_hostname}_{stack.project_name}")
+        stack_key = f"{server_key}_{_NODE_SAFE_RE.sub('_', stack.project_name)}"
+        stack_id = self._get_node_id_for_key("stack", stack_key)
 
-        lines.append(f"    {parent_id} --> {stack_id}")
-        lines.append(f"    {stack_id}[\"📦 Stack: {stack.project_name}\"]")
-        lines.append(f"    class {stack_id} stack")
+        write(self._STACK_TPL % (parent_id, stack_id, stack_id, stack.project_name, stack_id))
 
         for container in stack.containers:
-            container_lines = self._generate_container(
-                stack_id, server_hostname, container, is_standalone=False
+            self._write_container(
+                write, stack_id, server_hostname, server_key, container,
+                is_standalone=False,
             )
-            lines.extend(container_lines)
-
-        return lines
 
-    def _generate_container(
-        self, parent_id: str, server_hostname: str, container: Container, is_standalone: bool
-    ) -> List[str]:
+    def _write_container(
+        self,
+        write,
+        parent_id: str,
+        server_hostname: str,
+        server_key: str,
+        container: Container,
+        is_standalone: bool,
+    ) -> None:
         """
-        Generate nodes for a container.
+        Write nodes for a container.
 
         Args:
+            write: Output buffer's write method
             parent_id: Parent node ID (server or stack)
-            server_hostname: Hostname of the server (for unique node IDs)
+            server_hostname: Hostname of the server (for port URLs)
+            server_key: Sanitized hostname (for unique node IDs)
             container: Container object
             is_standalone: Whether container is standalone (not in stack)
-
-        Returns:
-            List of Mermaid diagram lines
         """
-        lines = []
-        container_id = self._get_node_id("container", f"{server_hostname}_{container.name}")
+        container_key = f"{server_key}_{_NODE_SAFE_RE.sub('_', container.name)}"
+        container_id = self._get_node_id_for_key("container", container_key)
+        get_port_id = self._get_port_id
+        port_tpl = self._PORT_TPL
 
         icon = "🐳" if is_standalone else "🔷"
         # Sanitize container name and image for Mermaid
         safe_name = self._sanitize_text(container.name)
         safe_image = self._sanitize_text(container.image)
+        node_class = "standalone" if is_standalone else "container"
+
+        write(self._CONTAINER_TPL % (
+            parent_id, container_id, container_id, icon, safe_name, safe_image,
+            container_id, node_class,
+        ))
+
+        # Add clickable links to access the services
+        # Use https for port 443, http for everything else
+        http_prefix = f"http://{server_hostname}:"
+        https_prefix = f"https://{server_hostname}:"
+
+        # Add port mappings (IPv4/IPv6 duplicates already removed)
+        for port in container.unique_ports:
+            host_port = port.host_port
+            port_id = get_port_id((container_key, host_port, port.container_port, port.protocol))
+
+            write(port_tpl % (
+                container_id, port_id,
+                port_id, host_port, port.container_port, port.protocol,
+                port_id,
+                port_id, https_prefix if host_port == 443 else http_prefix, host_port,
+            ))
+
+    def _get_node_id_for_key(self, prefix: str, key: str) -> str:
+        """
+        Get or create unique node ID for an already sanitized node key.
 
-        lines.append(f"    {parent_id} --> {container_id}")
-        lines.append(f'    {container_id}["{icon} {safe_name}<br/><small>{safe_image}</small>"]')
-
-        if is_standalone:
-            lines.append(f"    class {container_id} standalone")
-        else:
-            lines.append(f"    class {container_id} container")
-
-        # Add port mappings (deduplicate IPv4/IPv6)
-        seen_ports = {}
-        for port in container.ports:
-            port_key = f"{port.host_port}_{port.container_port}_{port.protocol}"
-
-            if port_key not in seen_ports:
-                # First time seeing this port mapping
-                port_id = self._get_node_id("port", f"{server_hostname}_{container.name}_{port_key}")
-                port_display = f"{port.host_port} → {port.container_port}/{port.protocol}"
+        Sanitizing works character by character, so keys for nested nodes can
+        be built by joining sanitized parts instead of sanitizing every
+        full name again.
 
-                lines.append(f"    {container_id} --> {port_id}")
-                lines.append(f'    {port_id}["🔌 {port_display}"]')
-                lines.append(f"    class {port_id} port")
+        Args:
+            prefix: Node type prefix (server, stack, container, port)
+            key: Node name with every non-alphanumeric character replaced by "_"
 
-                # Add clickable link to access the service
-                # Use https for port 443, http for everything else
-                protocol = "https" if port.host_port == 443 else "http"
-                url = f"{protocol}://{server_hostname}:{port.host_port}"
-                lines.append(f'    click {port_id} href "{url}"')
+        Returns:
+            Unique node ID
+        """
+        key = f"{prefix}_{key}"
 
-                seen_ports[port_key] = port_id
+        node_id = self.node_map.get(key)
+        if node_id is None:
+            node_id = f"{prefix}{self.node_counter}"
+            self.node_map[key] = node_id
+            self.node_counter += 1
 
-        return lines
+        return node_id
 
-    def _get_node_id(self, prefix: str, name: str) -> str:
+    def _get_port_id(self, port_key: Tuple[str, int, int, str]) -> str:
         """
-        Get or create unique node ID for Mermaid diagram.
+        Get or create unique node ID for a port mapping.
 
         Args:
-            prefix: Node type prefix (server, stack, container, port)
-            name: Node name
+            port_key: (container key, host port, container port, protocol); a
+                tuple needs neither sanitizing nor string building
 
         Returns:
             Unique node ID
         """
-        # Create a safe key from name
-        safe_name = "".join(c if c.isalnum() else "_" for c in name)
-        key = f"{prefix}_{safe_name}"
-
-        if key not in self.node_map:
-            self.node_map[key] = f"{prefix}{self.node_counter}"
+        node_id = self.node_map.get(port_key)
+        if node_id is None:
+            node_id = f"port{self.node_counter}"
+            self.node_map[port_key] = node_id
             self.node_counter += 1
 
-        return self.node_map[key]
+        return node_id
 
     def _sanitize_text(self, text: str) -> str:
         """
@@ -190,20 +284,7 @@ class MermaidGenerator:
         Returns:
             Sanitized text
         """
-        # Replace characters that might break Mermaid syntax
-        replacements = {
-            '"': "'",
-            "[": "(",
-            "]": ")",
-            "{": "(",
-            "}": ")",
-            "|": "/",
-        }
-
-        for old, new in replacements.items():
-            text = text.replace(old, new)
-
-        return text
+        return text.translate(_MERMAID_TRANS)
 
     def save_to_file(
         self, content: str, filename: str = "infrastructure.md", output_dir: Path = None
@@ -224,37 +305,45 @@ class MermaidGenerator:
         else:
             output_path = Path(output_dir) / filename
 
-        # Create full document with metadata
-        document = f"""# Docker Infrastructure Map
+        # Write the document around the diagram piecewise instead of
+        # building one concatenated copy of it
+        with open(output_path, "w", encoding="utf-8") as fh:
+            fh.write(self._DOCUMENT_HEAD % self._get_timestamp())
+            fh.write(content)
+            fh.write(self._DOCUMENT_TAIL)
 
-*Generated by Infrastructure Mapper on {self._get_timestamp()}*
-
-## Overview
-
-This diagram shows the current state of Docker containers across all configured servers.
-
-{content}
-
-## Legend
+        return output_path
 
-- 🖥️ **Server**: Physical or virtual server
-- 📦 **Stack**: Docker Compose project (group of related containers)
-- 🐳 **Standalone Container**: Individual Docker container (not part of a stack)
-- 🔷 **Stack Container**: Container managed by Docker Compose
-- 🔌 **Port Mapping**: Exposed port (format: host_port → container_port/protocol)
+    def generate_to_file(
+        self,
+        servers: List[ServerInfo],
+        filename: str = "infrastructure.md",
+        output_dir: Path = None,
+    ) -> Path:
+        """
+        Generate the diagram straight into a markdown file.
 
-## Notes
+        The diagram is streamed to disk with generate_into(), so it is never
+        held in memory as a whole.
 
-- Only running containers are shown
-- Port mappings show how services are exposed on the host
-- Containers in the same stack share the same Docker Compose project
+        Args:
+            servers: List of server information objects
+            filename: Output filename (default: infrastructure.md)
+            output_dir: Output directory (default: current directory)
 
----
+        Returns:
+            Path to saved file
+        """
+        if output_dir is None:
+            output_path = Path(filename)
+        else:
+            output_path = Path(output_dir) / filename
 
-*To update this diagram, run `infra-mapper` again*
-"""
+        with open(output_path, "w", encoding="utf-8") as fh:
+            fh.write(self._DOCUMENT_HEAD % self._get_timestamp())
+            self.generate_into(servers, fh)
+            fh.write(self._DOCUMENT_TAIL)
 
-        output_path.write_text(document, encoding="utf-8")
         return output_path
 
     @staticmethod
@@ -1,13 +1,21 @@
 """Container data model for Docker containers."""
 
-from typing import Dict, List, Optional
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Set, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 
 from .port_mapping import PortMapping
 
 
 class Container(BaseModel):
-    """Represents a Docker container with all its metadata."""
+    """Represents a Docker container with all its metadata.
+
+    Frozen once built from Docker's output. Derived values (unique ports,
+    Compose metadata) are computed on access rather than cached, since
+    model_copy(update=...) would carry a cached value over to a copy with
+    different ports or labels.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     container_id: str = Field(..., description="Container ID (short form)")
     name: str = Field(..., description="Container name")
@@ -16,7 +24,25 @@ class Container(BaseModel):
     ports: List[PortMapping] = Field(default_factory=list, description="Port mappings")
     networks: List[str] = Field(default_factory=list, description="Connected networks")
     labels: Dict[str, str] = Field(default_factory=dict, description="Container labels")
-    created_at: Optional[str] = Field(None, description="Container creation timestamp")
+    created_at: Optional[str] = Field(
+        None, description="Container creation timestamp (RFC 3339, UTC, whole seconds)"
+    )
+
+    @property
+    def unique_ports(self) -> List[PortMapping]:
+        """Get port mappings with IPv4/IPv6 duplicates of the same mapping removed.
+
+        Docker reports a published port once per address family; this keeps the
+        first mapping for each (host port, container port, protocol).
+        """
+        seen: Set[Tuple[int, int, str]] = set()
+        unique = []
+        for port in self.ports:
+            key = (port.host_port, port.container_port, port.protocol)
+            if key not in seen:
+                seen.add(key)
+                unique.append(port)
+        return unique
 
     @property
     def is_compose_managed(self) -> bool:
@@ -1,17 +1,24 @@
 """Docker Compose stack data model."""
 
-from typing import List
-from pydantic import BaseModel, Field
+from typing import Tuple
+from pydantic import BaseModel, ConfigDict, Field
 
 from .container import Container
 
 
 class DockerStack(BaseModel):
-    """Represents a Docker Compose stack (group of related containers)."""
+    """Represents a Docker Compose stack (group of related containers).
+
+    Frozen, with its containers held in a tuple. The derived counts are
+    computed on access rather than cached, since model_copy(update=...) would
+    carry a cached count over to a copy with different containers.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     project_name: str = Field(..., description="Docker Compose project name")
-    containers: List[Container] = Field(
-        default_factory=list, description="Containers in this stack"
+    containers: Tuple[Container, ...] = Field(
+        default_factory=tuple, description="Containers in this stack"
     )
 
     @property
@@ -1,10 +1,16 @@
 """Port mapping data model for Docker containers."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class PortMapping(BaseModel):
-    """Represents a port mapping from container to host."""
+    """Represents a port mapping from container to host.
+
+    Frozen, so instances are hashable and can be shared freely between
+    containers and generators.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     container_port: int = Field(..., description="Port inside the container")
     host_port: int = Field(..., description="Port on the host machine")
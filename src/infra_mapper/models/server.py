@@ -1,55 +1,108 @@
 """Server data models for SSH connection and infrastructure info."""
 
+from enum import Enum
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Literal, Optional
-from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Annotated, Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, TypeAdapter, model_validator
 
 from .container import Container
 from .docker_stack import DockerStack
 
 
+def _expand_path(v):
+    """Convert a string to Path and expand "~"; other values are left to type validation."""
+    if isinstance(v, (str, Path)):
+        return Path(v).expanduser()
+    return v
+
+
+# Filesystem path accepted as str or Path, with the user's home expanded
+_ExpandedPath = Annotated[Path, BeforeValidator(_expand_path)]
+
+# Reads DockerStack.container_count; lets sum() run over map() in C
+_container_count = attrgetter("container_count")
+
+
+class AuthMethod(str, Enum):
+    """SSH authentication method.
+
+    Members compare equal to their string values, so ``auth_method == "key"``
+    keeps working.
+    """
+
+    KEY = "key"
+    PASS = "pass"
+    AGENT = "agent"
+
+    def __str__(self) -> str:
+        """Format as the plain config value."""
+        return self.value
+
+
+class ConnectionStatus(str, Enum):
+    """Outcome of scanning a server.
+
+    Members compare equal to their string values, like AuthMethod.
+    """
+
+    NOT_CONNECTED = "not_connected"
+    SUCCESS = "success"
+    SSH_FAILED = "ssh_failed"
+    NO_DOCKER = "no_docker"
+    FAILED = "failed"
+
+    def __str__(self) -> str:
+        """Format as the plain status value."""
+        return self.value
+
+
 class ServerCredentials(BaseModel):
-    """SSH credentials and connection information for a server."""
+    """SSH credentials and connection information for a server.
+
+    Instances are immutable and hashable, so they can key per-server lookups
+    such as runtime-only passwords.
+    """
+
+    # Unknown fields are rejected rather than silently dropped
+    model_config = ConfigDict(frozen=True, extra="forbid")
 
     hostname: str = Field(..., description="Server hostname or IP address")
     username: str = Field(..., description="SSH username")
-    auth_method: Literal["key", "pass", "agent"] = Field(
-        default="key", description="Authentication method: 'key', 'pass', or 'agent'"
+    auth_method: AuthMethod = Field(
+        default=AuthMethod.KEY, description="Authentication method: 'key', 'pass', or 'agent'"
     )
-    ssh_key_path: Optional[Path] = Field(
+    ssh_key_path: Optional[_ExpandedPath] = Field(
         default=None, description="Path to SSH private key (required when auth_method='key')"
     )
-    port: int = Field(default=22, description="SSH port number")
+    port: int = Field(default=22, ge=1, le=65535, description="SSH port number")
 
     @model_validator(mode="after")
     def validate_auth_config(self) -> "ServerCredentials":
         """Ensure ssh_key_path is provided when auth_method is 'key'."""
-        if self.auth_method == "key" and self.ssh_key_path is None:
+        if self.auth_method is AuthMethod.KEY and self.ssh_key_path is None:
             raise ValueError("ssh_key_path is required when auth_method is 'key'")
         return self
 
-    @field_validator("ssh_key_path", mode="before")
     @classmethod
-    def validate_ssh_key_path(cls, v: Optional[Path]) -> Optional[Path]:
-        """Convert string to Path if needed."""
-        if v is None:
-            return None
-        if isinstance(v, str):
-            return Path(v).expanduser()
-        return v.expanduser()
-
-    @field_validator("port")
-    @classmethod
-    def validate_port(cls, v: int) -> int:
-        """Validate port number is in valid range."""
-        if not 1 <= v <= 65535:
-            raise ValueError(f"Port must be between 1 and 65535, got {v}")
-        return v
+    def validate_many(cls, rows: List[Dict[str, Any]]) -> List["ServerCredentials"]:
+        """
+        Validate a list of credential dicts in a single pydantic-core call.
+
+        Args:
+            rows: Field values for each server
+
+        Returns:
+            List of ServerCredentials, in the order of ``rows``
+
+        Raises:
+            pydantic.ValidationError: If any row is invalid
+        """
+        return _CREDENTIALS_LIST_ADAPTER.validate_python(rows)
 
     def __str__(self) -> str:
         """Format credentials as string for display."""
-        auth = self.auth_method
-        return f"{self.username}@{self.hostname}:{self.port} ({auth})"
+        return f"{self.username}@{self.hostname}:{self.port} ({self.auth_method})"
 
     def __repr__(self) -> str:
         """Detailed representation for debugging."""
@@ -59,39 +112,54 @@ class ServerCredentials(BaseModel):
         )
 
 
+# Built once; validates whole server lists without a Python-level loop
+_CREDENTIALS_LIST_ADAPTER = TypeAdapter(List[ServerCredentials])
+
+# ServerInfo display: status icon per connection status ("✗" for any failure)
+_STATUS_ICONS = {status: "✗" for status in ConnectionStatus}
+_STATUS_ICONS[ConnectionStatus.SUCCESS] = "✓"
+_SERVER_INFO_STR = "%s %s: %d stacks, %d standalone, %d total containers"
+
+
 class ServerInfo(BaseModel):
-    """Complete server information including credentials and discovered containers."""
+    """Complete server information including credentials and discovered containers.
+
+    Built once per scanned server and immutable afterwards.
+    """
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
 
     credentials: ServerCredentials = Field(..., description="Server connection credentials")
-    docker_stacks: List[DockerStack] = Field(
-        default_factory=list, description="Docker Compose stacks on this server"
+    docker_stacks: Tuple[DockerStack, ...] = Field(
+        default_factory=tuple, description="Docker Compose stacks on this server"
     )
-    standalone_containers: List[Container] = Field(
-        default_factory=list, description="Standalone containers (not in stacks)"
+    standalone_containers: Tuple[Container, ...] = Field(
+        default_factory=tuple, description="Standalone containers (not in stacks)"
     )
-    connection_status: str = Field(
-        default="not_connected", description="Connection status"
+    connection_status: ConnectionStatus = Field(
+        default=ConnectionStatus.NOT_CONNECTED, description="Connection status"
     )
     error_message: Optional[str] = Field(None, description="Error message if connection failed")
 
     @property
     def total_containers(self) -> int:
         """Get total number of containers (stacks + standalone)."""
-        stack_containers = sum(len(stack.containers) for stack in self.docker_stacks)
+        stack_containers = sum(map(_container_count, self.docker_stacks))
         return stack_containers + len(self.standalone_containers)
 
     @property
     def is_connected(self) -> bool:
         """Check if server connection was successful."""
-        return self.connection_status == "success"
+        return self.connection_status is ConnectionStatus.SUCCESS
 
     def __str__(self) -> str:
         """Format server info as string for display."""
-        status_icon = "✓" if self.is_connected else "✗"
-        return (
-            f"{status_icon} {self.credentials.hostname}: {len(self.docker_stacks)} stacks, "
-            f"{len(self.standalone_containers)} standalone, "
-            f"{self.total_containers} total containers"
+        return _SERVER_INFO_STR % (
+            _STATUS_ICONS[self.connection_status],
+            self.credentials.hostname,
+            len(self.docker_stacks),
+            len(self.standalone_containers),
+            self.total_containers,
         )
 
     def __repr__(self) -> str:
@@ -4,28 +4,34 @@
 class InfraMapperError(Exception):
     """Base exception for all Infrastructure Mapper errors."""
 
-    pass
+    __slots__ = ()
 
 
 class SSHConnectionError(InfraMapperError):
     """Raised when SSH connection fails."""
 
-    pass
+    __slots__ = ()
 
 
 class DockerNotFoundError(InfraMapperError):
     """Raised when Docker is not found on the target server."""
 
-    pass
+    __slots__ = ()
+
+
+class DockerDaemonError(InfraMapperError):
+    """Raised when Docker is installed but its daemon is not reachable."""
+
+    __slots__ = ()
 
 
 class DockerPermissionError(InfraMapperError):
     """Raised when Docker commands require elevated permissions."""
 
-    pass
+    __slots__ = ()
 
 
 class ConfigurationError(InfraMapperError):
     """Raised when configuration is invalid or cannot be loaded."""
 
-    pass
+    __slots__ = ()
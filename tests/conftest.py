@@ -0,0 +1,84 @@
+"""Shared fixtures for the infra-mapper test suite."""
+
+import pytest
+
+from infra_mapper.models.container import Container
+from infra_mapper.models.docker_stack import DockerStack
+from infra_mapper.models.port_mapping import PortMapping
+from infra_mapper.models.server import ServerCredentials, ServerInfo
+
+
+def _container(name, image, ports=()):
+    """Build a running container with the given (host_ip, host, container, proto) ports."""
+    return Container(
+        container_id=f"id-{name}",
+        name=name,
+        image=image,
+        status="running",
+        ports=[
+            PortMapping(host_ip=ip, host_port=host, container_port=port, protocol=proto)
+            for ip, host, port, proto in ports
+        ],
+    )
+
+
+def build_sample_servers():
+    """Servers covering every branch the generators render."""
+    web = ServerInfo(
+        credentials=ServerCredentials(
+            hostname="web-01.example.com", username="root", auth_method="agent"
+        ),
+        docker_stacks=[
+            DockerStack(
+                project_name="shop",
+                containers=[
+                    _container(
+                        "shop-web-1",
+                        "nginx:1.25",
+                        [
+                            ("0.0.0.0", 8080, 80, "tcp"),
+                            ("::", 8080, 80, "tcp"),
+                            ("0.0.0.0", 443, 443, "tcp"),
+                        ],
+                    ),
+                    _container("shop-db-1", "postgres:16", [("127.0.0.1", 5432, 5432, "tcp")]),
+                ],
+            ),
+            DockerStack(
+                project_name="mon[itor]",
+                containers=[
+                    _container(
+                        "grafana|1",
+                        "grafana/grafana:{latest}",
+                        [("0.0.0.0", 3000, 3000, "tcp"), ("0.0.0.0", 8125, 8125, "udp")],
+                    ),
+                ],
+            ),
+        ],
+        standalone_containers=[
+            _container("redis", "redis:7"),
+            _container("dns", "<coredns>", [("0.0.0.0", 53, 53, "udp")]),
+        ],
+        connection_status="success",
+    )
+    failed = ServerInfo(
+        credentials=ServerCredentials(hostname="db-02", username="root", auth_method="agent"),
+        connection_status="ssh_failed",
+        error_message="Authentication failed for root@db-02 <&>",
+    )
+    empty = ServerInfo(
+        credentials=ServerCredentials(hostname="10.0.0.3", username="root", auth_method="agent"),
+        connection_status="success",
+    )
+    return [web, failed, empty]
+
+
+@pytest.fixture
+def sample_servers():
+    return build_sample_servers()
+
+
+@pytest.fixture
+def make_container():
+    """Factory building a running container; see ``_container`` for the arguments."""
+    return _container
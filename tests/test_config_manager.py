@@ -0,0 +1,246 @@
+"""Tests for reading and writing server configuration files."""
+
+import json
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from infra_mapper.core import config_manager
+from infra_mapper.core.config_manager import ConfigManager
+from infra_mapper.models.server import ServerCredentials
+from infra_mapper.utils.exceptions import ConfigurationError
+
+
+@pytest.fixture
+def servers():
+    return [
+        ServerCredentials(
+            hostname="web-01", username="root", auth_method="key", ssh_key_path="/keys/id_ed25519"
+        ),
+        ServerCredentials(hostname="db-02", username="admin", auth_method="pass", port=2222),
+        ServerCredentials(hostname="10.0.0.3", username="deploy", auth_method="agent"),
+    ]
+
+
+@pytest.mark.parametrize("filename", ["servers.yaml", "servers.json"])
+def test_save_and_load_round_trip(filename, servers, tmp_path):
+    manager = ConfigManager(config_file=tmp_path / filename)
+
+    manager.save_servers(servers)
+
+    assert ConfigManager(config_file=tmp_path / filename).load_servers() == servers
+
+
+def test_json_config_is_plain_json(servers, tmp_path):
+    manager = ConfigManager(config_file=tmp_path / "servers.json")
+
+    manager.save_servers(servers)
+
+    data = json.loads((tmp_path / "servers.json").read_text(encoding="utf-8"))
+    assert data["servers"][0] == {
+        "hostname": "web-01",
+        "username": "root",
+        "auth_method": "key",
+        "port": 22,
+        "ssh_key_path": str(Path("/keys/id_ed25519")),
+    }
+    # Passwords are never written
+    assert data["servers"][1] == {
+        "hostname": "db-02", "username": "admin", "auth_method": "pass", "port": 2222,
+    }
+
+
+def test_load_accepts_legacy_password_auth(tmp_path):
+    config = tmp_path / "servers.json"
+    config.write_text(
+        '{"servers": [{"hostname": "db", "username": "root", "auth_method": "password"}]}',
+        encoding="utf-8",
+    )
+
+    (server,) = ConfigManager(config_file=config).load_servers()
+
+    assert server.auth_method == "pass"
+    assert server.port == 22
+
+
+@pytest.mark.parametrize("filename", ["servers.yaml", "servers.json"])
+def test_generated_template_loads(filename, tmp_path):
+    manager = ConfigManager(config_file=tmp_path / filename)
+
+    manager.generate_template()
+
+    assert [s.auth_method for s in manager.load_servers()] == ["key", "pass", "agent"]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        '{"servers": [',
+        '{"servers": [{"username": "root"}]}',
+        '{"servers": [{"hostname": "a", "username": "root", "auth_method": "key"}]}',
+    ],
+)
+def test_load_rejects_invalid_config(content, tmp_path):
+    config = tmp_path / "servers.json"
+    config.write_text(content, encoding="utf-8")
+
+    with pytest.raises(ConfigurationError):
+        ConfigManager(config_file=config).load_servers()
+
+
+def test_failed_write_keeps_previous_file(servers, tmp_path, monkeypatch):
+    manager = ConfigManager(config_file=tmp_path / "servers.yaml")
+    manager.save_servers(servers)
+    before = manager.config_file.read_bytes()
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(config_manager.os, "replace", fail_replace)
+
+    with pytest.raises(ConfigurationError):
+        manager.save_servers(servers[:1])
+
+    assert manager.config_file.read_bytes() == before
+    assert list(tmp_path.iterdir()) == [manager.config_file]
+
+
+def test_write_replaces_file_without_leftovers(servers, tmp_path):
+    manager = ConfigManager(config_file=tmp_path / "servers.yaml")
+
+    manager.save_servers(servers)
+    manager.save_servers(servers[:1])
+
+    assert manager.load_servers() == servers[:1]
+    assert list(tmp_path.iterdir()) == [manager.config_file]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_write_keeps_file_mode(servers, tmp_path):
+    manager = ConfigManager(config_file=tmp_path / "servers.yaml")
+    manager.save_servers(servers)
+    manager.config_file.chmod(0o640)
+
+    manager.save_servers(servers[:1])
+
+    assert stat.S_IMODE(manager.config_file.stat().st_mode) == 0o640
+
+
+def test_write_syncs_data_before_replacing(servers, tmp_path, monkeypatch):
+    manager = ConfigManager(config_file=tmp_path / "servers.yaml")
+    events = []
+    fsync, replace = config_manager.os.fsync, config_manager.os.replace
+    monkeypatch.setattr(config_manager.os, "fsync", lambda fd: events.append("fsync") or fsync(fd))
+    monkeypatch.setattr(
+        config_manager.os, "replace", lambda src, dst: events.append("replace") or replace(src, dst)
+    )
+
+    manager.save_servers(servers)
+
+    assert events == ["fsync", "replace"]
+
+
+def _write_keeping_mtime(path, content):
+    """Rewrite ``path`` in place while keeping its mtime, as a coarse-mtime filesystem would."""
+    st = path.stat()
+    with open(path, "r+b") as fh:
+        fh.write(content)
+        fh.truncate()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def test_load_servers_is_cached_until_file_changes(servers, tmp_path, monkeypatch):
+    manager = ConfigManager(config_file=tmp_path / "servers.json")
+    manager.save_servers(servers)
+    parsed = []
+    load_bytes = manager._load_bytes
+    monkeypatch.setattr(manager, "_load_bytes", lambda raw: parsed.append(raw) or load_bytes(raw))
+
+    assert manager.load_servers() == servers
+    assert manager.load_servers() == servers
+    assert len(parsed) == 1
+
+    # Written by another manager, i.e. outside this one's cache invalidation
+    ConfigManager(config_file=manager.config_file).save_servers(servers[:1])
+
+    assert manager.load_servers() == servers[:1]
+    assert len(parsed) == 2
+
+
+def test_load_servers_notices_edit_within_mtime_granularity(servers, tmp_path):
+    manager = ConfigManager(config_file=tmp_path / "servers.json")
+    manager.save_servers(servers)
+    assert manager.load_servers() == servers
+
+    _write_keeping_mtime(
+        manager.config_file,
+        b'{"servers": [{"hostname": "db", "username": "root", "auth_method": "agent"}]}',
+    )
+
+    assert [s.hostname for s in manager.load_servers()] == ["db"]
+
+
+def test_config_deleted_outside_manager(servers, tmp_path):
+    manager = ConfigManager(config_file=tmp_path / "servers.yaml")
+    manager.save_servers(servers)
+    assert manager.load_servers() == servers
+
+    manager.config_file.unlink()
+
+    assert not manager.config_exists()
+    assert manager.load_servers() is None
+
+
+def test_config_created_outside_manager(servers, tmp_path):
+    manager = ConfigManager(config_file=tmp_path / "servers.yaml")
+    assert not manager.config_exists()
+
+    ConfigManager(config_file=manager.config_file).save_servers(servers)
+
+    assert manager.config_exists()
+    assert manager.load_servers() == servers
+
+
+def test_delete_config(servers, tmp_path):
+    manager = ConfigManager(config_file=tmp_path / "servers.yaml")
+    manager.save_servers(servers)
+
+    manager.delete_config()
+    manager.delete_config()
+
+    assert not manager.config_exists()
+    assert manager.load_servers() is None
+
+
+def test_load_rejects_unknown_keys(tmp_path):
+    config = tmp_path / "servers.yaml"
+    config.write_text(
+        "servers:\n"
+        "  - hostname: web-01\n"
+        "    username: root\n"
+        "    auth_method: key\n"
+        "    ssh_key_path: ~/.ssh/id_ed25519\n"
+        "    prot: 2222\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ConfigurationError, match="prot"):
+        ConfigManager(config_file=config).load_servers()
+
+
+def test_load_ignores_key_path_for_other_auth_methods(tmp_path):
+    config = tmp_path / "servers.yaml"
+    config.write_text(
+        "servers:\n"
+        "  - hostname: web-01\n"
+        "    username: root\n"
+        "    auth_method: agent\n"
+        "    ssh_key_path: ~/.ssh/id_ed25519\n",
+        encoding="utf-8",
+    )
+
+    (server,) = ConfigManager(config_file=config).load_servers()
+
+    assert server.ssh_key_path is None
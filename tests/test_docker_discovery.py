@@ -0,0 +1,338 @@
+"""Tests for parsing `docker ps` and `docker inspect` output in DockerDiscoveryService."""
+
+import pytest
+
+from infra_mapper.core.docker_discovery import (
+    DockerDiscoveryService,
+    _created_at,
+    _json_loads,
+)
+from infra_mapper.models.container import Container
+from infra_mapper.models.port_mapping import PortMapping
+from infra_mapper.utils.exceptions import (
+    DockerDaemonError,
+    DockerNotFoundError,
+    DockerPermissionError,
+)
+
+# `docker ps --no-trunc --format '{{json .}}'` lines as printed by Docker 24-27
+PS_WEB = (
+    b'{"Command":"\\"/docker-entrypoint.sh nginx -g \'daemon off;\'\\"",'
+    b'"CreatedAt":"2024-01-02 03:04:05 +0000 UTC",'
+    b'"ID":"3f4e5d6c7b8a9f0e1d2c3b4a5f6e7d8c9b0a1f2e3d4c5b6a7f8e9d0c1b2a3f4e",'
+    b'"Image":"nginx:1.25",'
+    b'"Labels":"com.docker.compose.config-files=/srv/shop/compose.yml,/srv/shop/compose.override.yml,'
+    b'com.docker.compose.project=shop,com.docker.compose.service=web",'
+    b'"LocalVolumes":"0","Mounts":"","Names":"shop-web-1","Networks":"shop_default,proxy",'
+    b'"Ports":"0.0.0.0:8080->80/tcp, :::8080->80/tcp, 443/tcp",'
+    b'"RunningFor":"2 hours ago","Size":"0B","State":"running","Status":"Up 2 hours"}'
+)
+PS_STANDALONE = (
+    b'{"Command":"\\"docker-entrypoint.s\xe2\x80\xa6\\"",'
+    b'"CreatedAt":"2024-01-01 00:00:00 +0000 UTC",'
+    b'"ID":"0a1b2c3d4e5f60718293a4b5c6d7e8f90a1b2c3d4e5f60718293a4b5c6d7e8f9",'
+    b'"Image":"redis:7","Labels":"","LocalVolumes":"1","Mounts":"4c2b\xe2\x80\xa6",'
+    b'"Names":"redis","Networks":"bridge","Ports":"","RunningFor":"1 day ago",'
+    b'"Size":"0B","State":"running","Status":"Up 1 day"}'
+)
+
+# `docker inspect --format _INSPECT_FORMAT` lines
+INSPECT_WEB = (
+    b'{"Id":"3f4e5d6c7b8a9f0e1d2c3b4a5f6e7d8c9b0a1f2e3d4c5b6a7f8e9d0c1b2a3f4e",'
+    b'"Name":"/shop-web-1","Created":"2024-01-02T03:04:05.123456789Z",'
+    b'"Image":"nginx:1.25","Status":"running",'
+    b'"Labels":{"com.docker.compose.project":"shop","com.docker.compose.service":"web"},'
+    b'"Ports":{"443/tcp":null,"80/tcp":[{"HostIp":"0.0.0.0","HostPort":"8080"},'
+    b'{"HostIp":"::","HostPort":"8080"}]},'
+    b'"Networks":"proxy shop_default "}'
+)
+INSPECT_STANDALONE = (
+    b'{"Id":"0a1b2c3d4e5f60718293a4b5c6d7e8f90a1b2c3d4e5f60718293a4b5c6d7e8f9",'
+    b'"Name":"/redis","Created":"2024-01-01T00:00:00Z","Image":"redis:7",'
+    b'"Status":"running","Labels":null,"Ports":null,"Networks":""}'
+)
+
+
+class FakeSSH:
+    """Stands in for a connected SSHConnectionManager, answering commands from a table."""
+
+    hostname = "host-01"
+
+    def __init__(self, responses=None):
+        # Maps the start of a command to its (exit_code, stdout, stderr)
+        self.responses = responses or {}
+        self.commands = []
+
+    def execute_command(self, command, timeout=30, decode=True):
+        self.commands.append(command)
+        for needle, (exit_code, stdout, stderr) in self.responses.items():
+            if command.startswith(needle):
+                if decode and isinstance(stdout, bytes):
+                    stdout = stdout.decode("utf-8")
+                return exit_code, stdout, stderr
+        return 1, b"" if not decode else "", "unexpected command"
+
+
+@pytest.fixture
+def service():
+    return DockerDiscoveryService(FakeSSH())
+
+
+def _assert_valid(container):
+    """model_construct skips validation; re-validating must give the same container."""
+    assert Container.model_validate(container.model_dump()) == container
+
+
+def _ports(container):
+    return [(p.host_ip, p.host_port, p.container_port, p.protocol) for p in container.ports]
+
+
+@pytest.mark.parametrize(
+    "column, expected",
+    [
+        ("", []),
+        ("80/tcp", []),
+        ("0.0.0.0:8080->80/tcp", [("0.0.0.0", 8080, 80, "tcp")]),
+        # Docker < 26 prints IPv6 bindings unbracketed, newer releases bracket them
+        (
+            "0.0.0.0:8080->80/tcp, :::8080->80/tcp",
+            [("0.0.0.0", 8080, 80, "tcp"), ("::", 8080, 80, "tcp")],
+        ),
+        ("[::]:8080->80/tcp", [("::", 8080, 80, "tcp")]),
+        ("[::1]:5432->5432/tcp", [("::1", 5432, 5432, "tcp")]),
+        ("::1:5432->5432/tcp", [("::1", 5432, 5432, "tcp")]),
+        ("127.0.0.1:53->53/udp", [("127.0.0.1", 53, 53, "udp")]),
+        (
+            "0.0.0.0:8000-8002->9000-9002/tcp",
+            [
+                ("0.0.0.0", 8000, 9000, "tcp"),
+                ("0.0.0.0", 8001, 9001, "tcp"),
+                ("0.0.0.0", 8002, 9002, "tcp"),
+            ],
+        ),
+        (
+            "9000/tcp, 0.0.0.0:3000->3000/tcp, 8125/udp",
+            [("0.0.0.0", 3000, 3000, "tcp")],
+        ),
+    ],
+)
+def test_parse_ps_ports(column, expected):
+    mappings = DockerDiscoveryService._parse_ps_ports(column)
+
+    assert [(p.host_ip, p.host_port, p.container_port, p.protocol) for p in mappings] == expected
+    for mapping in mappings:
+        assert PortMapping.model_validate(mapping.model_dump()) == mapping
+
+
+@pytest.mark.parametrize(
+    "column, expected",
+    [
+        ("", {}),
+        ("maintainer=someone", {"maintainer": "someone"}),
+        ("a=1,b=", {"a": "1", "b": ""}),
+        ("a=x=y,b=2", {"a": "x=y", "b": "2"}),
+        (
+            "com.docker.compose.config-files=/a/compose.yml,/a/override.yml,"
+            "com.docker.compose.project=shop",
+            {
+                "com.docker.compose.config-files": "/a/compose.yml,/a/override.yml",
+                "com.docker.compose.project": "shop",
+            },
+        ),
+    ],
+)
+def test_parse_ps_labels(column, expected):
+    assert DockerDiscoveryService._parse_ps_labels(column) == expected
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("2024-01-02 03:04:05 +0000 UTC", "2024-01-02T03:04:05Z"),
+        ("2024-01-02 05:04:05 +0200 CEST", "2024-01-02T03:04:05Z"),
+        ("2024-01-02T03:04:05.123456789Z", "2024-01-02T03:04:05Z"),
+        ("2024-01-02T03:04:05Z", "2024-01-02T03:04:05Z"),
+        ("yesterday", "yesterday"),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_created_at_is_normalized(raw, expected):
+    assert _created_at(raw) == expected
+
+
+def test_parse_ps_entry_compose_container(service):
+    container = service._parse_ps_entry(_json_loads(PS_WEB))
+
+    _assert_valid(container)
+    assert container.container_id == "3f4e5d6c7b8a"
+    assert container.name == "shop-web-1"
+    assert container.status == "running"
+    assert container.networks == ["shop_default", "proxy"]
+    assert container.compose_project == "shop"
+    assert container.compose_service == "web"
+    assert _ports(container) == [("0.0.0.0", 8080, 80, "tcp"), ("::", 8080, 80, "tcp")]
+    assert container.created_at == "2024-01-02T03:04:05Z"
+
+
+def test_parse_ps_entry_without_ports_or_labels(service):
+    entry = _json_loads(PS_STANDALONE)
+    entry["Ports"] = None
+
+    container = service._parse_ps_entry(entry)
+
+    _assert_valid(container)
+    assert container.ports == []
+    assert container.labels == {}
+    assert not container.is_compose_managed
+
+
+def test_parse_container_data_matches_ps(service):
+    from_inspect = service._parse_container_data(_json_loads(INSPECT_WEB))
+    from_ps = service._parse_ps_entry(_json_loads(PS_WEB))
+
+    _assert_valid(from_inspect)
+    assert from_inspect.container_id == from_ps.container_id
+    assert from_inspect.name == from_ps.name
+    assert sorted(from_inspect.networks) == sorted(from_ps.networks)
+    assert _ports(from_inspect) == _ports(from_ps)
+    assert from_inspect.created_at == from_ps.created_at
+    assert from_inspect.compose_project == "shop"
+
+
+def test_parse_container_data_with_nulls(service):
+    container = service._parse_container_data(_json_loads(INSPECT_STANDALONE))
+
+    _assert_valid(container)
+    assert container.name == "redis"
+    assert container.ports == []
+    assert container.networks == []
+    assert container.labels == {}
+
+
+def test_parse_container_data_skips_malformed_bindings(service):
+    data = {
+        "Id": "abcdef0123456789",
+        "Name": "/odd",
+        "Image": "busybox",
+        "Status": "running",
+        "Ports": {
+            "53/udp": [{"HostIp": "", "HostPort": "5353"}],
+            "80/tcp": [{"HostIp": "0.0.0.0", "HostPort": ""}],
+            "81/tcp": [{"HostIp": "0.0.0.0"}],
+            "not-a-port": [{"HostIp": "0.0.0.0", "HostPort": "1"}],
+            "8080": [{"HostIp": "0.0.0.0", "HostPort": "8080"}],
+        },
+    }
+
+    container = service._parse_container_data(data)
+
+    _assert_valid(container)
+    assert _ports(container) == [("0.0.0.0", 5353, 53, "udp"), ("0.0.0.0", 8080, 8080, "tcp")]
+
+
+def test_get_all_containers_from_ps():
+    ssh = FakeSSH({"sudo docker ps --no-trunc": (0, PS_WEB + b"\n" + PS_STANDALONE + b"\n", "")})
+    service = DockerDiscoveryService(ssh)
+
+    containers = service._get_all_containers()
+
+    assert [c.name for c in containers] == ["shop-web-1", "redis"]
+    assert len(ssh.commands) == 1
+
+
+def test_get_all_containers_skips_broken_entry():
+    broken = b'{"ID":"0123456789abcdef","Image":"x"}'
+    ssh = FakeSSH({"sudo docker ps --no-trunc": (0, broken + b"\n" + PS_STANDALONE, "")})
+    service = DockerDiscoveryService(ssh)
+
+    assert [c.name for c in service._get_all_containers()] == ["redis"]
+
+
+@pytest.mark.parametrize("line", [b"42", b"null", b'"text"', b"[1, 2]"])
+def test_get_all_containers_falls_back_to_inspect_on_non_object_line(line):
+    ssh = FakeSSH({
+        "sudo docker ps --no-trunc": (0, line + b"\n" + PS_STANDALONE + b"\n", ""),
+        "sudo docker ps -q": (0, INSPECT_STANDALONE + b"\n", ""),
+    })
+    service = DockerDiscoveryService(ssh)
+
+    assert [c.name for c in service._get_all_containers()] == ["redis"]
+    assert "xargs -r sudo docker inspect" in ssh.commands[-1]
+
+
+def test_get_all_containers_skips_entry_with_non_string_id():
+    broken = b'{"ID":12345,"Image":"x"}'
+    ssh = FakeSSH({"sudo docker ps --no-trunc": (0, broken + b"\n" + PS_STANDALONE, "")})
+    service = DockerDiscoveryService(ssh)
+
+    assert [c.name for c in service._get_all_containers()] == ["redis"]
+
+
+def test_get_all_containers_falls_back_to_inspect():
+    ssh = FakeSSH({
+        "sudo docker ps --no-trunc": (0, b"Error: unknown format\n", ""),
+        "sudo docker ps -q": (0, INSPECT_WEB + b"\n" + INSPECT_STANDALONE + b"\n", ""),
+    })
+    service = DockerDiscoveryService(ssh)
+
+    containers = service._get_all_containers()
+
+    assert [c.name for c in containers] == ["shop-web-1", "redis"]
+    assert "xargs -r sudo docker inspect" in ssh.commands[-1]
+
+
+def test_verify_prefers_plain_docker():
+    ssh = FakeSSH({
+        "docker version": (0, b"27.1.1\n", ""),
+        "docker ps --no-trunc": (0, PS_STANDALONE + b"\n", ""),
+    })
+    service = DockerDiscoveryService(ssh)
+
+    ps_result = service._verify_docker_available()
+
+    assert service._docker_prefix == "docker"
+    assert ps_result[1] == PS_STANDALONE + b"\n"
+
+
+def test_verify_falls_back_to_sudo():
+    denied = (
+        "permission denied while trying to connect to the Docker daemon socket at "
+        "unix:///var/run/docker.sock"
+    )
+    ssh = FakeSSH({
+        "docker version": (1, b"", denied),
+        "docker ps": (1, b"", denied),
+        "sudo docker version": (0, "27.1.1\n", ""),
+    })
+    service = DockerDiscoveryService(ssh)
+
+    assert service._verify_docker_available() is None
+    assert service._docker_prefix == "sudo docker"
+
+
+@pytest.mark.parametrize(
+    "sudo_stderr, error",
+    [
+        ("sh: 1: docker: not found", DockerNotFoundError),
+        ("sudo: docker: command not found", DockerNotFoundError),
+        (
+            "permission denied while trying to connect to the Docker daemon socket",
+            DockerPermissionError,
+        ),
+        (
+            "Cannot connect to the Docker daemon at unix:///var/run/docker.sock. "
+            "Is the docker daemon running?",
+            DockerDaemonError,
+        ),
+    ],
+)
+def test_verify_reports_why_docker_is_unusable(sudo_stderr, error):
+    ssh = FakeSSH({
+        "docker": (1, b"", sudo_stderr),
+        "sudo docker version": (1, "", sudo_stderr),
+    })
+    service = DockerDiscoveryService(ssh)
+
+    with pytest.raises(error):
+        service._verify_docker_available()
@@ -0,0 +1,135 @@
+"""Golden-output tests for the HTML and Mermaid generators."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from infra_mapper.generators.html_generator import HtmlGenerator
+from infra_mapper.generators.mermaid_generator import _NODE_SAFE_RE, MermaidGenerator
+from infra_mapper.models.server import ServerCredentials, ServerInfo
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+TIMESTAMP = "2024-01-02 03:04:05"
+GENERATORS = [(HtmlGenerator, "infrastructure.html"), (MermaidGenerator, "infrastructure.md")]
+
+
+@pytest.fixture(autouse=True)
+def fixed_timestamp(monkeypatch):
+    for cls in (HtmlGenerator, MermaidGenerator):
+        monkeypatch.setattr(cls, "_get_timestamp", staticmethod(lambda: TIMESTAMP))
+
+
+@pytest.mark.parametrize("generator_cls, filename", GENERATORS)
+def test_streamed_file_matches_golden(generator_cls, filename, sample_servers, tmp_path):
+    saved = generator_cls().generate_to_file(sample_servers, filename, tmp_path)
+
+    expected = (GOLDEN_DIR / filename).read_text(encoding="utf-8")
+    assert saved.read_text(encoding="utf-8") == expected
+
+
+@pytest.mark.parametrize("generator_cls, filename", GENERATORS)
+def test_saved_content_matches_streamed_file(generator_cls, filename, sample_servers, tmp_path):
+    generator = generator_cls()
+    content = generator.generate(sample_servers)
+
+    saved = generator.save_to_file(content, filename, tmp_path)
+
+    # Only the streamed HTML fragment keeps its final newline
+    expected = (GOLDEN_DIR / filename).read_text(encoding="utf-8")
+    if generator_cls is HtmlGenerator:
+        expected = expected[:-1]
+    assert saved.read_text(encoding="utf-8") == expected
+
+
+def test_html_generate_into_streams_same_fragment(sample_servers):
+    generator = HtmlGenerator()
+    buf = io.StringIO()
+
+    generator.generate_into(sample_servers, buf)
+
+    assert buf.getvalue() == generator.generate(sample_servers) + "\n"
+
+
+def test_mermaid_generate_into_streams_same_diagram(sample_servers):
+    generator = MermaidGenerator()
+    buf = io.StringIO()
+
+    generator.generate_into(sample_servers, buf)
+
+    assert buf.getvalue() == generator.generate(sample_servers)
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["web-01.example.com", "shop_web 1", "café", "cafè", "サーバー１", "Ⅻ-½²", "a\tb c"],
+)
+def test_mermaid_node_keys_keep_isalnum_characters(name):
+    expected = "".join(c if c.isalnum() else "_" for c in name)
+
+    assert _NODE_SAFE_RE.sub("_", name) == expected
+
+
+def test_mermaid_keeps_non_ascii_hostnames_apart():
+    servers = [
+        ServerInfo(
+            credentials=ServerCredentials(hostname=name, username="root", auth_method="agent"),
+            connection_status="success",
+        )
+        for name in ("café", "cafè")
+    ]
+
+    diagram = MermaidGenerator().generate(servers)
+
+    assert 'server0["🖥️ café"]' in diagram
+    assert 'server1["🖥️ cafè"]' in diagram
+
+
+def test_html_port_links_escape_hostname_once(make_container):
+    server = ServerInfo(
+        credentials=ServerCredentials(hostname="a&b", username="root", auth_method="agent"),
+        standalone_containers=[
+            make_container(
+                "web", "nginx", [("0.0.0.0", 8080, 80, "tcp"), ("0.0.0.0", 443, 443, "tcp")]
+            )
+        ],
+        connection_status="success",
+    )
+
+    html = HtmlGenerator().generate([server])
+
+    assert 'href="http://a&amp;b:8080"' in html
+    assert 'href="https://a&amp;b:443"' in html
+    assert "&amp;amp;" not in html
+
+
+def test_mermaid_node_ids_restart_on_each_generate(sample_servers):
+    generator = MermaidGenerator()
+
+    assert generator.generate(sample_servers) == generator.generate(sample_servers)
+
+
+def test_mermaid_merges_nodes_for_repeated_hostname(sample_servers):
+    web = sample_servers[0]
+
+    diagram = MermaidGenerator().generate([web, web])
+
+    assert diagram.count('server0["🖥️ web-01.example.com"]') == 2
+    assert "server1[" not in diagram.replace("server10", "")
+
+
+def test_mermaid_port_nodes_are_unique_per_mapping(make_container):
+    server = ServerInfo(
+        credentials=ServerCredentials(hostname="h", username="root", auth_method="agent"),
+        standalone_containers=[
+            make_container("a", "img", [("0.0.0.0", 80, 80, "tcp"), ("0.0.0.0", 80, 80, "udp")]),
+            make_container("b", "img", [("0.0.0.0", 81, 80, "tcp")]),
+        ],
+        connection_status="success",
+    )
+    generator = MermaidGenerator()
+
+    generator.generate([server])
+
+    port_ids = [v for k, v in generator.node_map.items() if isinstance(k, tuple)]
+    assert len(port_ids) == len(set(port_ids)) == 3
@@ -0,0 +1,52 @@
+"""Tests for the interactive configuration flow of the CLI."""
+
+import pytest
+from rich.prompt import Confirm
+
+from infra_mapper.__main__ import InfraMapper
+from infra_mapper.models.server import ServerCredentials
+
+TYPED_SERVER = ServerCredentials(hostname="new-01", username="root", auth_method="agent")
+
+
+@pytest.fixture
+def answers(monkeypatch):
+    """Answer every confirmation with its default, as pressing Enter would; records the prompts."""
+    asked = []
+
+    def ask(prompt, *args, default=False, **kwargs):
+        asked.append((prompt, default))
+        return default
+
+    monkeypatch.setattr(Confirm, "ask", ask)
+    monkeypatch.setattr(InfraMapper, "_prompt_servers", lambda self: [TYPED_SERVER])
+    return asked
+
+
+def test_config_that_fails_to_load_is_not_overwritten_by_default(answers, tmp_path):
+    config = tmp_path / "servers.yaml"
+    original = (
+        "servers:\n"
+        "  - hostname: web-01\n"
+        "    username: root\n"
+        "    auth_method: agent\n"
+        "    prot: 2222\n"
+    )
+    config.write_text(original, encoding="utf-8")
+
+    servers = InfraMapper(config_path=str(config))._get_server_configurations()
+
+    assert servers == [TYPED_SERVER]
+    assert answers[-1][1] is False
+    assert config.read_text(encoding="utf-8") == original
+
+
+def test_new_config_is_saved_by_default(answers, tmp_path):
+    config = tmp_path / "servers.yaml"
+    config.write_text("servers: []\n", encoding="utf-8")
+
+    servers = InfraMapper(config_path=str(config))._get_server_configurations()
+
+    assert servers == [TYPED_SERVER]
+    assert answers[-1][1] is True
+    assert InfraMapper(config_path=str(config)).config_manager.load_servers() == [TYPED_SERVER]
@@ -0,0 +1,89 @@
+"""Tests for the data models."""
+
+import pytest
+from pydantic import ValidationError
+
+from infra_mapper.models.docker_stack import DockerStack
+from infra_mapper.models.server import ServerCredentials
+
+
+def test_docker_stack_counts_cannot_go_stale(make_container):
+    stack = DockerStack(
+        project_name="shop",
+        containers=[
+            make_container("web", "nginx", [("0.0.0.0", 80, 80, "tcp"), ("::", 80, 80, "tcp")]),
+            make_container("db", "postgres"),
+        ],
+    )
+    assert (stack.container_count, stack.total_ports) == (2, 2)
+
+    with pytest.raises(ValidationError):
+        stack.containers = ()
+    with pytest.raises(AttributeError):
+        stack.containers.append(make_container("cache", "redis"))
+
+    assert (stack.container_count, stack.total_ports) == (2, 2)
+
+
+def test_container_unique_ports_follow_model_copy(make_container):
+    container = make_container(
+        "dns", "coredns", [("0.0.0.0", 53, 53, "udp"), ("::", 53, 53, "udp")]
+    )
+    assert len(container.unique_ports) == 1
+
+    copy = container.model_copy(update={"ports": []})
+
+    assert copy.unique_ports == []
+
+
+def test_derived_values_follow_model_copy(make_container):
+    plain = make_container("web", "nginx", [("0.0.0.0", 80, 80, "tcp")])
+    assert plain.compose_project is None
+
+    web = plain.model_copy(update={"labels": {"com.docker.compose.project": "shop"}})
+    stack = DockerStack(project_name="shop", containers=[web])
+    assert (stack.container_count, stack.total_ports) == (1, 1)
+
+    copy = stack.model_copy(update={"containers": (web, make_container("db", "postgres"))})
+
+    assert web.is_compose_managed and web.compose_project == "shop"
+    assert (copy.container_count, copy.total_ports) == (2, 1)
+
+
+def test_server_info_total_follows_model_copy(sample_servers):
+    web = sample_servers[0]
+    assert web.total_containers == 5
+
+    copy = web.model_copy(update={"standalone_containers": ()})
+
+    assert copy.total_containers == 3
+
+
+def test_server_credentials_display_follows_model_copy():
+    creds = ServerCredentials(hostname="web-01", username="root", auth_method="agent")
+    assert str(creds) == "root@web-01:22 (agent)"
+    repr(creds)
+
+    copy = creds.model_copy(update={"port": 2222})
+
+    assert str(copy) == "root@web-01:2222 (agent)"
+    assert "port=2222" in repr(copy)
+    assert creds == ServerCredentials(hostname="web-01", username="root", auth_method="agent")
+
+
+def test_server_info_str_follows_model_copy(sample_servers):
+    web = sample_servers[0]
+    assert str(web) == "✓ web-01.example.com: 2 stacks, 2 standalone, 5 total containers"
+
+    copy = web.model_copy(update={"connection_status": "failed"})
+
+    assert str(copy) == "✗ web-01.example.com: 2 stacks, 2 standalone, 5 total containers"
+
+
+def test_server_info_repr_follows_model_copy(sample_servers):
+    web = sample_servers[0]
+    assert "status='success'" in repr(web)
+
+    copy = web.model_copy(update={"connection_status": "failed", "docker_stacks": ()})
+
+    assert repr(copy) == "ServerInfo(hostname='web-01.example.com', status='failed', containers=2)"